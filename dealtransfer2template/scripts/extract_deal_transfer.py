@@ -9,37 +9,72 @@ Output:
     JSON with S1 and S2 data
 """
 
-import pandas as pd
+from openpyxl import load_workbook
 import json
 import sys
 from pathlib import Path
 
+# orjson is a faster drop-in for large sheets; fall back to stdlib json
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+def _dedup_columns(columns):
+    """Rename repeated header names the way pandas does: A, A.1, A.2, ..."""
+    counts = {}
+    deduped = []
+    for col in columns:
+        cur_count = counts.get(col, 0)
+        while cur_count > 0:
+            counts[col] = cur_count + 1
+            col = f'{col}.{cur_count}'
+            cur_count = counts.get(col, 0)
+        deduped.append(col)
+        counts[col] = cur_count + 1
+    return deduped
+
+def _read_sheet(ws):
+    """Stream a worksheet into columns + records (first row is the header)."""
+    rows = ws.iter_rows(values_only=True)
+    header = next(rows, ())
+    columns = _dedup_columns([
+        col if col is not None else f'Unnamed: {i}'
+        for i, col in enumerate(header)
+    ])
+    width = len(columns)
+    # read_only rows can stop at their last filled cell; pad so every
+    # record has every column (missing cells become None)
+    records = [
+        dict(zip(columns, row if len(row) >= width else row + (None,) * (width - len(row))))
+        for row in rows
+        if any(cell is not None for cell in row)
+    ]
+    return {
+        'columns': columns,
+        'data': records
+    }
+
 def extract_deal_transfer(excel_path):
     """Extract S1 and S2 sheets from Deal Transfer."""
     try:
-        xls = pd.ExcelFile(excel_path)
-        
-        # Read S1 and S2 sheets
-        s1 = pd.read_excel(excel_path, sheet_name='Commercial')
-        s2 = pd.read_excel(excel_path, sheet_name='Technical')
-        
-        # Convert to dict for easier access
-        result = {
-            'sheets': xls.sheet_names,
-            'S1': {
-                'columns': s1.columns.tolist(),
-                'data': s1.to_dict('records')
-            },
-            'S2': {
-                'columns': s2.columns.tolist(),
-                'data': s2.to_dict('records')
+        # Single streaming pass over the workbook (read_only avoids building
+        # the full cell tree, data_only returns cached formula values)
+        wb = load_workbook(excel_path, read_only=True, data_only=True)
+        try:
+            result = {
+                'sheets': wb.sheetnames,
+                'S1': _read_sheet(wb['Commercial']),
+                'S2': _read_sheet(wb['Technical'])
             }
-        }
+        finally:
+            wb.close()
         
         return result
     except FileNotFoundError:
         return {'error': f'File not found: {excel_path}'}
-    except ValueError as e:
+    except (KeyError, ValueError) as e:
         return {'error': f'Sheet not found: {str(e)}'}
     except Exception as e:
         return {'error': f'Error reading file: {str(e)}'}
@@ -56,5 +91,12 @@ if __name__ == '__main__':
         print(f"Error: {result['error']}", file=sys.stderr)
         sys.exit(1)
     
-    print(json.dumps(result, indent=2, default=str))
-
+    if HAS_ORJSON:
+        sys.stdout.buffer.write(orjson.dumps(
+            result,
+            option=(orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+                    | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_APPEND_NEWLINE),
+            default=str
+        ))
+    else:
+        print(json.dumps(result, indent=2, default=str))
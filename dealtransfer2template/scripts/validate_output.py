@@ -4,111 +4,135 @@ Validate generated proposal files.
 
 Usage:
     python validate_output.py <template_file> [reasoning_file] [checklist_file]
+
+The module is fully annotated and uses only the stdlib, so for batch runs it
+can be compiled with mypyc (`mypyc validate_output.py`) or run under PyPy.
 """
 
 import re
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+
+ValidationResult = Tuple[List[str], List[str]]
+
+# Precompiled bytes patterns (shared by all validators). Files are read as
+# bytes and every token we look for is ASCII, so no decode is needed.
+_SRC_REF_RE = re.compile(rb'S[12]\s*-\s*["\']')
+# Reasoning text (specific patterns to avoid false positives), fused into one scan
+_REASONING_RE = re.compile(
+    rb'(Based on\s+S[12]'      # "Based on S1" or "Based on S2"
+    rb'|Logic:\s*[A-Z]'        # "Logic: ..."
+    rb'|Calculated as\s*\d'    # "Calculated as 123"
+    rb'|Extracted from\s+S[12]'  # "Extracted from S1"
+    rb'|Source:\s*S[12]'       # "Source: S1"
+    rb'|From\s+KB\s)',         # "From KB ..."
+    re.IGNORECASE
+)
+# Pattern: Any text (including numbers, spaces, operators) followed by [PLACEHOLDER_ID]
+_PLACEHOLDER_RE = re.compile(rb'([^\[\]\n]+?)\s+\[([A-Z_]+\d+)\]')
+_HEADING_RE = re.compile(rb'^(##\s+.+?)$', re.MULTILINE)
+_CONTENT_REF_RE = re.compile(rb'\*\*Content in Template\*\*:')
+_PID_RE = re.compile(rb'\[([A-Z_]+\d+)\]')
+# "| ID |" followed (anywhere later) by "| Section |"; the lookahead lets the
+# two cells share the separating pipe, as in "| ID | Section |"
+_CHECK_HEADERS_RE = re.compile(rb'\| ID (?=\|).*?\| Section \|', re.DOTALL)
 
-def validate_template(content):
-    """Check template file format."""
-    errors = []
-    warnings = []
+def _is_blank_or_rule(line: bytes) -> bool:
+    """True for whitespace-only lines and horizontal rules (---)."""
+    stripped = line.rstrip()
+    return not stripped or (stripped.startswith(b'---') and not stripped.strip(b'-'))
+
+def _text(value: bytes) -> str:
+    """Decode a matched bytes fragment for display."""
+    return value.decode('utf-8', errors='replace')
+
+def validate_template(content: bytes) -> ValidationResult:
+    """Check template file format (content is raw bytes)."""
+    errors: List[str] = []
+    warnings: List[str] = []
     
     # Check for source references (should not exist)
-    if re.search(r'S[12]\s*-\s*["\']', content):
+    if _SRC_REF_RE.search(content):
         errors.append("❌ Template contains source references (S1/S2)")
     
     # Check for reasoning text (more specific patterns to avoid false positives)
-    reasoning_patterns = [
-        r'Based on\s+S[12]',  # "Based on S1" or "Based on S2"
-        r'Logic:\s*[A-Z]',     # "Logic: ..."
-        r'Calculated as\s*\d',  # "Calculated as 123"
-        r'Extracted from\s+S[12]',  # "Extracted from S1"
-        r'Source:\s*S[12]',     # "Source: S1"
-        r'From\s+KB\s',         # "From KB ..."
-    ]
-    for pattern in reasoning_patterns:
-        if re.search(pattern, content, re.IGNORECASE):
-            errors.append(f"❌ Template contains reasoning text (matched: {pattern})")
-            break
+    match = _REASONING_RE.search(content)
+    if match:
+        errors.append(f"❌ Template contains reasoning text (matched: {_text(match.group(1))})")
     
     # Check placeholder format
-    # Pattern: Any text (including numbers, spaces, operators) followed by [PLACEHOLDER_ID]
     # Match only the placeholder part, not the whole line
-    placeholder_pattern = r'([^\[\]\n]+?)\s+\[([A-Z_]+\d+)\]'
-    placeholder_matches = re.findall(placeholder_pattern, content)
+    placeholder_matches = _PLACEHOLDER_RE.findall(content)
     
     if not placeholder_matches:
         warnings.append("⚠️  No placeholders found (may be intentional if all values confirmed)")
     else:
-        # Validate placeholder format - check each placeholder
+        # Validate placeholder format - the ID shape is enforced by _PLACEHOLDER_RE,
+        # so only the value part needs checking. It is never empty (the pattern
+        # needs 1+ chars) but can be whitespace-only, e.g. "30 [NET_001]   [NET_002]".
         for value_part, placeholder_id in placeholder_matches:
-            # Value part should not be empty
-            if not value_part.strip():
-                errors.append(f"❌ Empty value before placeholder: [{placeholder_id}]")
-            # Placeholder ID should match pattern
-            if not re.match(r'[A-Z_]+\d+', placeholder_id):
-                errors.append(f"❌ Invalid placeholder ID format: [{placeholder_id}]")
+            if value_part.isspace():
+                errors.append(f"❌ Empty value before placeholder: [{_text(placeholder_id)}]")
         
         # Check for placeholders with explanations after them (should be in parentheses or separate clause)
         # This is acceptable: "30 Mbps [NETWORK_001] (for remote access)"
         # But catch obvious errors like placeholders in wrong position
     
     # Check for empty sections
-    # Find all ## headings and check if any have no content before next ## heading
-    headings = list(re.finditer(r'^(##\s+.+?)$', content, re.MULTILINE))
-    empty_sections = []
-    for i, match in enumerate(headings):
-        start = match.end()
-        # Get content until next ## heading or EOF
-        if i + 1 < len(headings):
-            end = headings[i+1].start()
-            section_content = content[start:end]
-        else:
-            section_content = content[start:]
-        # Remove whitespace and horizontal rules (---)
-        cleaned = re.sub(r'^---+?\s*$', '', section_content, flags=re.MULTILINE).strip()
-        if not cleaned:
-            empty_sections.append(match.group(1))
+    # Split on ## headings in one pass: parts = [preamble, heading, body, heading, body, ...]
+    parts = _HEADING_RE.split(content)
+    empty_sections: List[str] = []
+    for heading, section_content in zip(parts[1::2], parts[2::2]):
+        # Empty if only whitespace and horizontal rules (---)
+        if all(_is_blank_or_rule(line) for line in section_content.splitlines()):
+            empty_sections.append(_text(heading))
     
     if empty_sections:
         warnings.append(f"⚠️  Found {len(empty_sections)} empty section(s): {', '.join(empty_sections[:3])}")
     
     return errors, warnings
 
-def validate_reasoning(content):
-    """Check reasoning file format."""
-    errors = []
-    warnings = []
+def validate_reasoning(content: bytes) -> ValidationResult:
+    """Check reasoning file format (content is raw bytes)."""
+    errors: List[str] = []
+    warnings: List[str] = []
     
     # Should contain source references
-    if not re.search(r'S[12]\s*-\s*["\']', content):
+    if not _SRC_REF_RE.search(content):
         warnings.append("⚠️  Reasoning file should contain S1/S2 references")
     
     # Should contain "Content in Template" sections
-    if not re.search(r'\*\*Content in Template\*\*:', content):
+    if not _CONTENT_REF_RE.search(content):
         warnings.append("⚠️  Reasoning file should reference template content")
     
     return errors, warnings
 
-def validate_checklist(content):
-    """Check checklist file format."""
-    errors = []
-    warnings = []
+def validate_checklist(content: bytes) -> ValidationResult:
+    """Check checklist file format (content is raw bytes)."""
+    errors: List[str] = []
+    warnings: List[str] = []
     
     # Should contain table with correct columns
-    if '| ID |' not in content or '| Section |' not in content:
+    if not _CHECK_HEADERS_RE.search(content):
         errors.append("❌ Checklist missing required table columns")
     
-    # Should have placeholder IDs
-    placeholder_ids = re.findall(r'\[([A-Z_]+\d+)\]', content)
-    if not placeholder_ids:
+    # Should have placeholder IDs (stop at the first one found)
+    if not _PID_RE.search(content):
         warnings.append("⚠️  No placeholder IDs found in checklist")
     
     return errors, warnings
 
-def main():
+def _run(path: Path, validator: Callable[[bytes], ValidationResult]) -> Optional[ValidationResult]:
+    """Read a file and validate it; returns None if the file is missing."""
+    try:
+        content = path.read_bytes()
+    except FileNotFoundError:
+        return None
+    return validator(content)
+
+def main() -> None:
     if len(sys.argv) < 2:
         print("Usage: validate_output.py <template_file> [reasoning_file] [checklist_file]")
         sys.exit(1)
@@ -117,52 +141,37 @@ def main():
     reasoning_file = Path(sys.argv[2]) if len(sys.argv) > 2 else None
     checklist_file = Path(sys.argv[3]) if len(sys.argv) > 3 else None
     
-    all_errors = []
-    all_warnings = []
-    
-    # Validate template
-    if template_file.exists():
-        template_content = template_file.read_text()
-        errors, warnings = validate_template(template_content)
-        all_errors.extend(errors)
-        all_warnings.extend(warnings)
-        print(f"\n📄 Validating {template_file.name}:")
-        if errors:
-            print("\n".join(errors))
-        if warnings:
-            print("\n".join(warnings))
-        if not errors and not warnings:
-            print("✅ Template file is valid")
-    else:
-        print(f"❌ Template file not found: {template_file}")
-    
-    # Validate reasoning
-    if reasoning_file and reasoning_file.exists():
-        reasoning_content = reasoning_file.read_text()
-        errors, warnings = validate_reasoning(reasoning_content)
-        all_errors.extend(errors)
-        all_warnings.extend(warnings)
-        print(f"\n📄 Validating {reasoning_file.name}:")
-        if errors:
-            print("\n".join(errors))
-        if warnings:
-            print("\n".join(warnings))
-        if not errors and not warnings:
-            print("✅ Reasoning file is valid")
-    
-    # Validate checklist
-    if checklist_file and checklist_file.exists():
-        checklist_content = checklist_file.read_text()
-        errors, warnings = validate_checklist(checklist_content)
+    # (file, validator, label) in report order
+    jobs = [(template_file, validate_template, "Template")]
+    if reasoning_file:
+        jobs.append((reasoning_file, validate_reasoning, "Reasoning"))
+    if checklist_file:
+        jobs.append((checklist_file, validate_checklist, "Checklist"))
+    
+    # Reads and regex scans release the GIL, so validate the files concurrently
+    with ThreadPoolExecutor(max_workers=len(jobs)) as pool:
+        futures = [pool.submit(_run, path, validator) for path, validator, _ in jobs]
+        results = [future.result() for future in futures]
+    
+    all_errors: List[str] = []
+    all_warnings: List[str] = []
+    
+    for (path, _, label), result in zip(jobs, results):
+        if result is None:
+            # Only the template is required; optional files are skipped silently
+            if path is template_file:
+                print(f"❌ Template file not found: {template_file}")
+            continue
+        errors, warnings = result
         all_errors.extend(errors)
         all_warnings.extend(warnings)
-        print(f"\n📄 Validating {checklist_file.name}:")
+        print(f"\n📄 Validating {path.name}:")
         if errors:
             print("\n".join(errors))
         if warnings:
             print("\n".join(warnings))
         if not errors and not warnings:
-            print("✅ Checklist file is valid")
+            print(f"✅ {label} file is valid")
     
     # Summary
     print(f"\n{'='*50}")
@@ -5,14 +5,13 @@ Combines parse_proposal.py and generate_mermaid.py
 """
 
 import sys
-import json
 from pathlib import Path
 
-# Add parent directory to path to import modules
-sys.path.insert(0, str(Path(__file__).parent))
-
+# Sibling modules resolve via sys.path[0] (this script's directory) when run
+# directly, and via the orchestrator's path setup when imported
 from parse_proposal import ProposalParser
-from generate_mermaid import ArchitectureGenerator
+from generate_mermaid import ArchitectureGenerator, ARCHITECTURE_MD_TEMPLATE
+from output_utils import dumps_json, flush_output
 
 
 def generate_architecture_from_proposal(proposal_file, output_dir=None):
@@ -29,7 +28,9 @@ def generate_architecture_from_proposal(proposal_file, output_dir=None):
         print(f"Error: Proposal file not found: {proposal_file}")
         return None
     
-    print(f"📄 Parsing proposal: {proposal_file.name}")
+    # Progress lines are buffered and written once per phase instead of per print()
+    out = [f"📄 Parsing proposal: {proposal_file.name}"]
+    flush_output(out)  # before parsing, so parser diagnostics follow it
     
     # Parse proposal
     parser = ProposalParser(proposal_file)
@@ -37,19 +38,23 @@ def generate_architecture_from_proposal(proposal_file, output_dir=None):
     
     # Validate required fields
     if not project_info.get("num_cameras"):
-        print("⚠️  Warning: Camera number not found. Please check the proposal.")
+        out.append("⚠️  Warning: Camera number not found. Please check the proposal.")
+        flush_output(out)
         return None
     
     if not project_info.get("ai_modules"):
-        print("⚠️  Warning: AI modules not found. Please check the proposal.")
+        out.append("⚠️  Warning: AI modules not found. Please check the proposal.")
+        flush_output(out)
         return None
     
     # Print extracted information
-    print("\n" + "="*80)
-    print("EXTRACTED PROJECT INFORMATION")
-    print("="*80)
-    print(json.dumps(project_info, indent=2, ensure_ascii=False))
-    print("="*80 + "\n")
+    out.append(f"""
+{"="*80}
+EXTRACTED PROJECT INFORMATION
+{"="*80}
+{dumps_json(project_info).decode('utf-8')}
+{"="*80}
+""")
     
     # Generate JSON file
     if output_dir is None:
@@ -59,47 +64,48 @@ def generate_architecture_from_proposal(proposal_file, output_dir=None):
         output_dir.mkdir(parents=True, exist_ok=True)
     
     json_file = output_dir / f"{proposal_file.stem}_project_info.json"
-    with open(json_file, 'w', encoding='utf-8') as f:
-        json.dump({"project_info": project_info}, f, indent=2, ensure_ascii=False)
-    print(f"✅ Saved project info to: {json_file}")
+    json_file.write_bytes(dumps_json({"project_info": project_info}))
+    out.append(f"✅ Saved project info to: {json_file}")
     
     # Generate Mermaid diagram
-    print("\n🎨 Generating Mermaid architecture diagram...")
+    out.append("\n🎨 Generating Mermaid architecture diagram...")
     generator = ArchitectureGenerator(project_info)
     mermaid_code = generator.generate()
     
     # Save Mermaid diagram
     mermaid_file = output_dir / f"{proposal_file.stem}_architecture_diagram.md"
-    with open(mermaid_file, 'w', encoding='utf-8') as f:
-        f.write(f"# System Architecture: {project_info['project_name']}\n\n")
-        f.write(f"**Client:** {project_info.get('client_name', 'N/A')}\n\n")
-        f.write(f"**Deployment Method:** {project_info['deployment_method'].upper()}\n\n")
-        f.write(f"**Cameras:** {project_info['num_cameras']}\n\n")
-        f.write(f"**AI Modules:** {len(project_info['ai_modules'])}\n\n")
-        f.write("---\n\n")
-        f.write("## Architecture Diagram\n\n")
-        f.write("```mermaid\n")
-        f.write(mermaid_code)
-        f.write("\n```\n")
-    
-    print(f"✅ Saved architecture diagram to: {mermaid_file}")
+    mermaid_file.write_bytes(ARCHITECTURE_MD_TEMPLATE.format(
+        project_name=project_info['project_name'],
+        client_name=project_info.get('client_name', 'N/A'),
+        deployment_method=project_info['deployment_method'].upper(),
+        num_cameras=project_info['num_cameras'],
+        num_ai_modules=len(project_info['ai_modules']),
+        mermaid_code=mermaid_code
+    ).encode('utf-8'))
+    
+    out.append(f"✅ Saved architecture diagram to: {mermaid_file}")
     
     # Print summary
-    print("\n" + "="*80)
-    print("GENERATION SUMMARY")
-    print("="*80)
-    print(f"Project: {project_info['project_name']}")
-    print(f"Deployment: {project_info['deployment_method'].upper()}")
-    print(f"Cameras: {project_info['num_cameras']}")
-    print(f"AI Modules: {len(project_info['ai_modules'])}")
-    print(f"Alert Methods: {', '.join(project_info['alert_methods'])}")
-    print("="*80)
-    print(f"\n📁 Output files:")
-    print(f"   - JSON: {json_file}")
-    print(f"   - Diagram: {mermaid_file}")
-    print(f"\n💡 View diagram at: https://mermaid.live")
-    print("   Or open the .md file in VS Code with Mermaid extension")
-    print("="*80 + "\n")
+    out.append(f"""
+{"="*80}
+GENERATION SUMMARY
+{"="*80}
+Project: {project_info['project_name']}
+Deployment: {project_info['deployment_method'].upper()}
+Cameras: {project_info['num_cameras']}
+AI Modules: {len(project_info['ai_modules'])}
+Alert Methods: {', '.join(project_info['alert_methods'])}
+{"="*80}
+
+📁 Output files:
+   - JSON: {json_file}
+   - Diagram: {mermaid_file}
+
+💡 View diagram at: https://mermaid.live
+   Or open the .md file in VS Code with Mermaid extension
+{"="*80}
+""")
+    flush_output(out)
     
     return {
         "json_file": json_file,
@@ -4,25 +4,79 @@ Main script to generate architecture diagram from Deal Transfer file
 Supports both Deal Transfer files and Proposal Templates
 """
 
+import os
+import re
 import sys
 import json
+import hashlib
 from pathlib import Path
 
-# Add parent directory to path to import modules
-sys.path.insert(0, str(Path(__file__).parent))
-
+# Sibling modules resolve via sys.path[0] (this script's directory) when run
+# directly, and via the orchestrator's path setup when imported
 from parse_deal_transfer import DealTransferParser
 from parse_proposal import ProposalParser
-from generate_mermaid import ArchitectureGenerator
+from generate_mermaid import ArchitectureGenerator, ARCHITECTURE_MD_TEMPLATE
+from output_utils import dumps_json, flush_output
+
+# Questions that only appear in Deal Transfer files (checked in one scan)
+DEAL_TRANSFER_MARKERS = re.compile(
+    rb'Does client have stable internet connection'
+    rb'|Any GDPR or data privacy requirements'
+    rb'|Any specific HW/SW requirements such as deployment method'
+    rb'|List of VA use cases'
+)
+
+# On-disk cache of parse results, keyed on the input file and parser module.
+# Kept next to this script (not the working directory) unless overridden
+_SCRIPT_DIR = Path(__file__).resolve().parent
+PARSE_CACHE_DIR = Path(os.environ.get('TEMPLATE2SLIDE_PARSE_CACHE_DIR')
+                       or _SCRIPT_DIR / '.cache' / 'parser')
+
+
+def _file_stat_key(path):
+    """(resolved path, mtime_ns, size) - changes whenever the file is edited"""
+    path = Path(path).resolve()
+    stat = path.stat()
+    return str(path), stat.st_mtime_ns, stat.st_size
 
 
-def generate_architecture_from_file(input_file, output_dir=None):
+def _parse_cached(parser_cls, input_file):
+    """
+    Parse input_file with parser_cls, reusing a cached result when neither the
+    input nor the parser module file (path, mtime, size) has changed.
+    
+    Returns:
+        (project_info, cache_hit)
+    """
+    parser_file = sys.modules[parser_cls.__module__].__file__
+    key = hashlib.sha1(repr((
+        _file_stat_key(input_file), parser_cls.__name__, _file_stat_key(parser_file)
+    )).encode('utf-8')).hexdigest()
+    cache_file = PARSE_CACHE_DIR / f"{key}.json"
+    
+    try:
+        return json.loads(cache_file.read_bytes()), True
+    except (OSError, ValueError):
+        pass
+    
+    project_info = parser_cls(input_file).parse()
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        cache_file.write_bytes(dumps_json(project_info))
+    except OSError:
+        pass  # caching is best-effort
+    return project_info, False
+
+
+def generate_architecture_from_file(input_file, output_dir=None, use_cache=False):
     """
     Main function to generate architecture from Deal Transfer or Proposal Template
     
     Args:
         input_file: Path to Deal Transfer or Proposal Template file
         output_dir: Output directory (default: same as input file)
+        use_cache: Reuse the parse result cached in PARSE_CACHE_DIR when the
+            input file is unchanged (default: False; the CLI turns it on)
     """
     input_file = Path(input_file)
     
@@ -30,7 +84,8 @@ def generate_architecture_from_file(input_file, output_dir=None):
         print(f"Error: Input file not found: {input_file}")
         return None
     
-    print(f"📄 Processing file: {input_file.name}")
+    # Progress lines are buffered and written once per phase instead of per print()
+    out = [f"📄 Processing file: {input_file.name}"]
     
     # Determine file type and parse accordingly
     file_ext = input_file.suffix.lower()
@@ -42,29 +97,30 @@ def generate_architecture_from_file(input_file, output_dir=None):
         file_ext in ['.xlsx', '.xls']
     )
     
-    # Also check content for Deal Transfer patterns
+    # Only sniff content when the name/extension didn't already decide
     if not is_deal_transfer:
         try:
-            with open(input_file, 'r', encoding='utf-8') as f:
+            with open(input_file, 'rb') as f:
                 content_preview = f.read(500)
-                if any(keyword in content_preview for keyword in [
-                    'Does client have stable internet connection',
-                    'Any GDPR or data privacy requirements',
-                    'Any specific HW/SW requirements such as deployment method',
-                    'List of VA use cases'
-                ]):
-                    is_deal_transfer = True
-        except:
+            if DEAL_TRANSFER_MARKERS.search(content_preview):
+                is_deal_transfer = True
+        except OSError:
             pass
     
     if is_deal_transfer:
-        print("📋 Detected: Deal Transfer file")
-        parser = DealTransferParser(input_file)
+        out.append("📋 Detected: Deal Transfer file")
+        parser_cls = DealTransferParser
     else:
-        print("📋 Detected: Proposal Template file")
-        parser = ProposalParser(input_file)
-    
-    project_info = parser.parse()
+        out.append("📋 Detected: Proposal Template file")
+        parser_cls = ProposalParser
+    flush_output(out)  # before parsing, so parser diagnostics follow it
+    
+    if use_cache:
+        project_info, cache_hit = _parse_cached(parser_cls, input_file)
+        if cache_hit:
+            out.append("♻️  Using cached parse result (input unchanged)")
+    else:
+        project_info = parser_cls(input_file).parse()
     
     # Validate required fields - NO DEFAULT VALUES, raise errors instead
     errors = []
@@ -81,23 +137,29 @@ def generate_architecture_from_file(input_file, output_dir=None):
         errors.append("Client name")
     
     if errors:
-        print("\n" + "="*80)
-        print("❌ ERROR: Required fields not found in template")
-        print("="*80)
-        for error in errors:
-            print(f"   - {error}")
-        print("\n⚠️  Cannot generate architecture without these required fields.")
-        print("   Please check the template and ensure all required fields are present.")
-        print("   Do NOT use default values - all values must be extracted from the template.")
-        print("="*80 + "\n")
+        missing = "\n".join(f"   - {error}" for error in errors)
+        out.append(f"""
+{"="*80}
+❌ ERROR: Required fields not found in template
+{"="*80}
+{missing}
+
+⚠️  Cannot generate architecture without these required fields.
+   Please check the template and ensure all required fields are present.
+   Do NOT use default values - all values must be extracted from the template.
+{"="*80}
+""")
+        flush_output(out)
         return None
     
     # Print extracted information
-    print("\n" + "="*80)
-    print("EXTRACTED PROJECT INFORMATION")
-    print("="*80)
-    print(json.dumps(project_info, indent=2, ensure_ascii=False))
-    print("="*80 + "\n")
+    out.append(f"""
+{"="*80}
+EXTRACTED PROJECT INFORMATION
+{"="*80}
+{dumps_json(project_info).decode('utf-8')}
+{"="*80}
+""")
     
     # Generate JSON file
     if output_dir is None:
@@ -107,47 +169,48 @@ def generate_architecture_from_file(input_file, output_dir=None):
         output_dir.mkdir(parents=True, exist_ok=True)
     
     json_file = output_dir / f"{input_file.stem}_project_info.json"
-    with open(json_file, 'w', encoding='utf-8') as f:
-        json.dump({"project_info": project_info}, f, indent=2, ensure_ascii=False)
-    print(f"✅ Saved project info to: {json_file}")
+    json_file.write_bytes(dumps_json({"project_info": project_info}))
+    out.append(f"✅ Saved project info to: {json_file}")
     
     # Generate Mermaid diagram
-    print("\n🎨 Generating Mermaid architecture diagram...")
+    out.append("\n🎨 Generating Mermaid architecture diagram...")
     generator = ArchitectureGenerator(project_info)
     mermaid_code = generator.generate()
     
     # Save Mermaid diagram
     mermaid_file = output_dir / f"{input_file.stem}_architecture_diagram.md"
-    with open(mermaid_file, 'w', encoding='utf-8') as f:
-        f.write(f"# System Architecture: {project_info['project_name']}\n\n")
-        f.write(f"**Client:** {project_info.get('client_name', 'N/A')}\n\n")
-        f.write(f"**Deployment Method:** {project_info['deployment_method'].upper().replace('-', ' ')}\n\n")
-        f.write(f"**Cameras:** {project_info['num_cameras']}\n\n")
-        f.write(f"**AI Modules:** {len(project_info['ai_modules'])}\n\n")
-        f.write("---\n\n")
-        f.write("## Architecture Diagram\n\n")
-        f.write("```mermaid\n")
-        f.write(mermaid_code)
-        f.write("\n```\n")
-    
-    print(f"✅ Saved architecture diagram to: {mermaid_file}")
+    mermaid_file.write_bytes(ARCHITECTURE_MD_TEMPLATE.format(
+        project_name=project_info['project_name'],
+        client_name=project_info.get('client_name', 'N/A'),
+        deployment_method=project_info['deployment_method'].upper().replace('-', ' '),
+        num_cameras=project_info['num_cameras'],
+        num_ai_modules=len(project_info['ai_modules']),
+        mermaid_code=mermaid_code
+    ).encode('utf-8'))
+    
+    out.append(f"✅ Saved architecture diagram to: {mermaid_file}")
     
     # Print summary
-    print("\n" + "="*80)
-    print("GENERATION SUMMARY")
-    print("="*80)
-    print(f"Project: {project_info['project_name']}")
-    print(f"Deployment: {project_info['deployment_method'].upper().replace('-', ' ')}")
-    print(f"Cameras: {project_info['num_cameras']}")
-    print(f"AI Modules: {len(project_info['ai_modules'])}")
-    print(f"Alert Methods: {', '.join(project_info['alert_methods'])}")
-    print("="*80)
-    print(f"\n📁 Output files:")
-    print(f"   - JSON: {json_file}")
-    print(f"   - Diagram: {mermaid_file}")
-    print(f"\n💡 View diagram at: https://mermaid.live")
-    print("   Or open the .md file in VS Code with Mermaid extension")
-    print("="*80 + "\n")
+    out.append(f"""
+{"="*80}
+GENERATION SUMMARY
+{"="*80}
+Project: {project_info['project_name']}
+Deployment: {project_info['deployment_method'].upper().replace('-', ' ')}
+Cameras: {project_info['num_cameras']}
+AI Modules: {len(project_info['ai_modules'])}
+Alert Methods: {', '.join(project_info['alert_methods'])}
+{"="*80}
+
+📁 Output files:
+   - JSON: {json_file}
+   - Diagram: {mermaid_file}
+
+💡 View diagram at: https://mermaid.live
+   Or open the .md file in VS Code with Mermaid extension
+{"="*80}
+""")
+    flush_output(out)
     
     return {
         "json_file": json_file,
@@ -157,18 +220,23 @@ def generate_architecture_from_file(input_file, output_dir=None):
 
 
 if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print("Usage: python3 generate_from_deal_transfer.py <input_file> [output_dir]")
+    use_cache = '--no-cache' not in sys.argv
+    args = [arg for arg in sys.argv[1:] if arg != '--no-cache']
+    
+    if len(args) < 1:
+        print("Usage: python3 generate_from_deal_transfer.py <input_file> [output_dir] [--no-cache]")
         print("\nSupports:")
         print("  - Deal Transfer files (.txt, .md, .xlsx)")
         print("  - Proposal Template files (.md)")
+        print("\nOptions:")
+        print(f"  --no-cache  Always re-parse the input (skip {PARSE_CACHE_DIR})")
         print("\nExample:")
         print("  python3 generate_from_deal_transfer.py Deal_Transfer_Shell.txt")
         print("  python3 generate_from_deal_transfer.py proposal_template.md ./output")
         sys.exit(1)
     
-    input_file = sys.argv[1]
-    output_dir = sys.argv[2] if len(sys.argv) > 2 else None
+    input_file = args[0]
+    output_dir = args[1] if len(args) > 1 else None
     
-    generate_architecture_from_file(input_file, output_dir)
+    generate_architecture_from_file(input_file, output_dir, use_cache=use_cache)
 
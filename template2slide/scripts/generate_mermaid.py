@@ -5,61 +5,247 @@ Clean, client-friendly format showing essential flow only
 Compact mode: AI modules embedded inline, simplified labels
 """
 
-import re
+import functools
+import string
+
+# Markdown wrapper used by the generator scripts when saving a diagram
+ARCHITECTURE_MD_TEMPLATE = (
+    "# System Architecture: {project_name}\n\n"
+    "**Client:** {client_name}\n\n"
+    "**Deployment Method:** {deployment_method}\n\n"
+    "**Cameras:** {num_cameras}\n\n"
+    "**AI Modules:** {num_ai_modules}\n\n"
+    "---\n\n"
+    "## Architecture Diagram\n\n"
+    "```mermaid\n{mermaid_code}\n```\n"
+)
+
+
+def _strip_trailing_paren(name):
+    """Drop a trailing "(...)" qualifier, e.g. "Helmet Detection (Standard)".
+    
+    Equivalent to re.sub(r'\s*\([^)]*\)\s*$', '', name.strip()), using str
+    methods: the earliest '(' after the last inner ')' opens the suffix.
+    """
+    name = name.strip()
+    if not name.endswith(')'):
+        return name
+    i = name.find('(', name.rfind(')', 0, -1) + 1, -1)
+    return name if i < 0 else name[:i].rstrip()
+
+
+# project_info keys read by the generate_* methods; anything else (project
+# name, client, ...) does not affect the diagram and is left out of the cache key
+DIAGRAM_KEYS = (
+    'deployment_method', 'num_cameras', 'ai_modules', 'alert_methods',
+    'internet_type', 'include_nvr', 'list_ai_modules', 'compact_mode',
+)
+
+
+def _freeze(value):
+    """Hashable (type, value) form of a project_info value.
+
+    The type is kept because lru_cache compares keys with ==, so 8 and 8.0
+    (or 1 and True) would otherwise share an entry and render differently.
+    Lists and tuples are frozen element by element.
+    """
+    if isinstance(value, (list, tuple)):
+        return (type(value), tuple(_freeze(item) for item in value))
+    return (type(value), value)
+
+
+def _thaw(frozen):
+    """Rebuild the original value from _freeze() output"""
+    kind, value = frozen
+    if kind is list or kind is tuple:
+        return kind(_thaw(item) for item in value)
+    return value
+
+
+def _diagram_key(project_info):
+    """Canonical, hashable key for the fields that shape the diagram.
+
+    Only keys that are present are included, since _show_nvr treats a
+    missing 'include_nvr' differently from an explicit value.
+    """
+    return tuple(
+        (key, _freeze(project_info[key]))
+        for key in DIAGRAM_KEYS if key in project_info
+    )
+
+
+@functools.lru_cache(maxsize=256)
+def _generate_cached(frozen_info):
+    """Build the diagram for a frozen project_info; generators are pure"""
+    info = {key: _thaw(frozen) for key, frozen in frozen_info}
+    return ArchitectureGenerator(info)._generate()
+
+
+# Node styles shared across diagrams; templates reference them as {STYLE_*}
+# and they are folded into the literal fragments when the template is compiled
+_STYLE_DASHBOARD = "fill:#fff4e1,stroke:#e65100,stroke-width:2px,color:#000000"
+_STYLE_ALERT = "fill:#f3e5f5,stroke:#7b1fa2,stroke-width:2px,color:#000000"
+_STYLE_CAMERAS = "fill:#ffffff,stroke:#424242,stroke-width:2px,color:#000000"
+_STYLE_AI_INFERENCE = "fill:#81d4fa,stroke:#0277bd,stroke-width:2px,color:#000000"
+_STYLE_AI_TRAINING = "fill:#e1f5ff,stroke:#01579b,stroke-width:2px,color:#000000"
+_STYLE_NETWORK = "fill:#e8f5e9,stroke:#2e7d32,stroke-width:2px,color:#000000"
+_STYLE_AI_MODULE = "fill:#f5f5f5,stroke:#616161,stroke-width:2px,color:#000000"
+# Dashboard + Alert rows, identical in the on-prem, cloud, 4G and viMov footers
+_OUTPUT_STYLES = (
+    f"style Dashboard {_STYLE_DASHBOARD}\n"
+    f"    style Alert {_STYLE_ALERT}"
+)
+
+_TEMPLATE_CONSTANTS = {
+    'STYLE_DASHBOARD': _STYLE_DASHBOARD,
+    'STYLE_ALERT': _STYLE_ALERT,
+    'STYLE_CAMERAS': _STYLE_CAMERAS,
+    'STYLE_AI_INFERENCE': _STYLE_AI_INFERENCE,
+    'STYLE_AI_TRAINING': _STYLE_AI_TRAINING,
+    'STYLE_NETWORK': _STYLE_NETWORK,
+    'STYLE_AI_MODULE': _STYLE_AI_MODULE,
+    'OUTPUT_STYLES': _OUTPUT_STYLES,
+}
+
+# (subgraph, connections, styles) for an AI node without a module listing
+_EMPTY_AI_FRAGMENTS = ('', '', '')
+
+
+def _compile_template(text):
+    """Split a diagram template into (literal, slot name) fragments once.
+    
+    Fields naming a _TEMPLATE_CONSTANTS entry are resolved here, so only the
+    per-call slots remain.
+    """
+    parts = []
+    pending = ''
+    for literal, field, _, _ in string.Formatter().parse(text):
+        pending += literal
+        if field in _TEMPLATE_CONSTANTS:
+            pending += _TEMPLATE_CONSTANTS[field]
+            continue
+        parts.append((pending, field))
+        pending = ''
+    if pending:
+        parts.append((pending, None))
+    return tuple(parts)
+
+
+def _fill(parts, slots):
+    """Join precompiled template fragments, substituting the named slots"""
+    return ''.join([literal + slots[field] if field else literal for literal, field in parts])
+
+
+@functools.lru_cache(maxsize=64)
+def _ai_module_styles(count):
+    """Style statements for Mod_1..Mod_<count>; depends on the count only"""
+    return '\n'.join(f'    class Mod_{i} aiModuleStyle' for i in range(1, count + 1))
 
 
 class ArchitectureGenerator:
     """Generate Mermaid architecture diagrams matching KB examples"""
     
+    __slots__ = ('info', '_show_nvr_value')
+    
     def __init__(self, project_info):
-        self.info = project_info
+        # Shallow copy so normalizing below never touches the caller's dict
+        self.info = dict(project_info)
+        method = self.info.get('deployment_method')
+        if isinstance(method, str):
+            self.info['deployment_method'] = method.lower()
     
     def _get_ai_modules_styles(self, ai_modules):
         """Generate style statements for all AI modules"""
-        if not ai_modules:
-            return ''
-        styles = []
-        for i in range(len(ai_modules)):
-            styles.append(f'    class Mod_{i+1} aiModuleStyle')
-        return '\n'.join(styles)
+        return _ai_module_styles(len(ai_modules)) if ai_modules else ''
     
     def _format_ai_modules_inline(self, ai_modules, max_length=50):
         """Format AI modules as inline list for compact display"""
         if not ai_modules:
             return ""
-        # Shorten module names if needed, then join with line breaks
-        short_modules = []
-        for module in ai_modules:
-            # Remove common suffixes in parentheses for compactness
-            short_name = re.sub(r'\s*\([^)]*\)\s*$', '', module.strip())
-            # Truncate if too long
-            if len(short_name) > max_length:
-                short_name = short_name[:max_length-3] + "..."
-            short_modules.append(short_name)
-        return "<br/>".join(short_modules)
-        
-    def _should_show_nvr(self):
-        """Determine if NVR should be shown based on deployment method and requirements"""
+        # Remove common suffixes in parentheses for compactness, truncate
+        # names that are still too long, then join with line breaks
+        cut = max_length - 3
+        short_names = [_strip_trailing_paren(module) for module in ai_modules]
+        return "<br/>".join([name if len(name) <= max_length else name[:cut] + "..."
+                             for name in short_names])
+        
+    def _build_ai_block(self, node_id, label, ai_modules, compact_mode, list_ai_modules,
+                        expanded_label=None):
+        """Build the AI processing node plus its module subgraph/edges/styles.
+        
+        Compact mode embeds the module names inline in the node; otherwise the
+        modules are listed in a separate "AI Modules" subgraph (if enabled) and
+        the node shows expanded_label (defaults to label).
+        Returns (node, subgraph, connections, styles).
+        """
+        if not ai_modules or not (compact_mode or list_ai_modules):
+            # Nothing to show for the modules: bare node only
+            return (f'{node_id}["{expanded_label or label}"]',) + _EMPTY_AI_FRAGMENTS
+        if compact_mode:
+            ai_modules_text = self._format_ai_modules_inline(ai_modules)
+            return (f'{node_id}["{label}<br/>{ai_modules_text}"]',) + _EMPTY_AI_FRAGMENTS
+        
+        node = f'{node_id}["{expanded_label or label}"]'
+        # AI Modules - list all with full names, arranged horizontally
+        ai_modules_subgraph = ''.join([
+            '    subgraph "AI Modules"\n        direction LR\n',
+            *[f'        Mod_{i}["{module.strip()}"]\n' for i, module in enumerate(ai_modules, 1)],
+            '    end\n    ',
+        ])
+        ai_modules_connections = ''.join(
+            f'    {node_id} --> Mod_{i}\n' for i in range(1, len(ai_modules) + 1))
+        return node, ai_modules_subgraph, ai_modules_connections, self._get_ai_modules_styles(ai_modules)
+        
+    @property
+    def _show_nvr(self):
+        """Whether NVR should be shown, based on deployment method and requirements (computed once)"""
+        try:
+            return self._show_nvr_value
+        except AttributeError:
+            pass
+        info = self.info
         # Check if include_nvr is explicitly set in project info
-        if 'include_nvr' in self.info:
+        if 'include_nvr' in info:
             # Respect explicit flag for both cloud and on-premise
-            return self.info.get('include_nvr')
-        
-        # Default behavior if flag is not set
-        if self.info.get('deployment_method') == 'cloud':
-            # For cloud, NVR is usually optional (default False)
-            return False
+            show = info['include_nvr']
         else:
-            # For on-premise, show NVR by default (but mark as optional)
-            return True
+            # Default behavior if flag is not set: for cloud, NVR is usually
+            # optional (default False); for on-premise, show NVR by default
+            # (but mark as optional)
+            show = info.get('deployment_method') != 'cloud'
+        self._show_nvr_value = show
+        return show
+    
+    _ON_PREM_PARTS = _compile_template("""graph TB
+    subgraph "On-Premise Infrastructure"
+        {camera_group}
+        {nvr_node}
+        {ai_training}
+        {ai_inference}
+        {dashboard}
+        {alert_system}
+    end
+    
+{ai_modules_subgraph}    {nvr_connection}
+    AI_Training -->|Trained Models| AI_Inference
+    AI_Inference -->|Detection Results| Dashboard
+    AI_Inference -->|Alerts| Alert
+{ai_modules_connections}    style AI_Training {STYLE_AI_TRAINING}
+    style AI_Inference {STYLE_AI_INFERENCE}
+    {OUTPUT_STYLES}
+    style Cameras {STYLE_CAMERAS}
+    classDef aiModuleStyle {STYLE_AI_MODULE}
+{ai_modules_styles}
+""")
     
     def generate_on_prem(self):
         """Generate On-Premise Architecture Diagram matching KB examples"""
-        num_cameras = self.info.get('num_cameras', 8)
-        ai_modules = self.info.get('ai_modules', [])
-        show_nvr = self._should_show_nvr()
-        list_ai_modules = self.info.get('list_ai_modules', True)
-        compact_mode = self.info.get('compact_mode', True)
+        info = self.info
+        num_cameras = info.get('num_cameras', 8)
+        ai_modules = info.get('ai_modules', ())
+        show_nvr = self._show_nvr
+        list_ai_modules = info.get('list_ai_modules', True)
+        compact_mode = info.get('compact_mode', True)
         
         # Camera - match KB format
         camera_group = f'Cameras["Up to {num_cameras} Cameras<br/>IP-based Camera"]'
@@ -77,79 +263,82 @@ class ArchitectureGenerator:
         ai_training = 'AI_Training["AI Training<br/>(On-Premise)"]'
         
         # AI Modules: embed inline if compact_mode, otherwise separate subgraph
-        if compact_mode and ai_modules:
-            ai_modules_text = self._format_ai_modules_inline(ai_modules)
-            ai_inference = f'AI_Inference["AI Inference<br/>(On-Premise Processing)<br/>{ai_modules_text}"]'
-            ai_modules_subgraph = ''
-            ai_modules_connections = ''
-            ai_modules_styles = ''
-        else:
-            ai_inference = 'AI_Inference["AI Inference<br/>(On-Premise Processing)"]'
-            # AI Modules - list all with full names, arranged horizontally (optional)
-            ai_modules_subgraph = ''
-            ai_modules_connections = ''
-            if list_ai_modules and ai_modules:
-                module_list = []
-                for i, module in enumerate(ai_modules, 1):
-                    module_name = module.strip()
-                    node_id = f'Mod_{i}'
-                    module_list.append(f'{node_id}["{module_name}"]')
-                    ai_modules_connections += f'    AI_Inference --> {node_id}\n'
-                
-                ai_modules_nodes = '\n        '.join(module_list)
-                ai_modules_subgraph = f'''    subgraph "AI Modules"
-        direction LR
-        {ai_modules_nodes}
-    end
-    '''
-            ai_modules_styles = self._get_ai_modules_styles(ai_modules) if list_ai_modules and ai_modules else ''
+        (ai_inference, ai_modules_subgraph, ai_modules_connections,
+         ai_modules_styles) = self._build_ai_block(
+            'AI_Inference', 'AI Inference<br/>(On-Premise Processing)', ai_modules, compact_mode, list_ai_modules)
         
         # Dashboard - simplified, compact format
         dashboard = 'Dashboard["Local Dashboard"]'
         
         # Alert system - simplified, compact format
-        alerts = self.info.get('alert_methods', ['Email', 'Dashboard'])
+        alerts = info.get('alert_methods')
         alert_list = ' & '.join(alerts) if alerts else 'Email & Dashboard'
         alert_system = f'Alert["Alert/Notification<br/>({alert_list})"]'
         
-        template = f"""graph TB
-    subgraph "On-Premise Infrastructure"
+        return _fill(self._ON_PREM_PARTS, {
+            'camera_group': camera_group,
+            'nvr_node': nvr_node,
+            'ai_training': ai_training,
+            'ai_inference': ai_inference,
+            'dashboard': dashboard,
+            'alert_system': alert_system,
+            'ai_modules_subgraph': ai_modules_subgraph,
+            'nvr_connection': nvr_connection,
+            'ai_modules_connections': ai_modules_connections,
+            'ai_modules_styles': ai_modules_styles,
+        })
+    
+    _CLOUD_PARTS = _compile_template("""graph LR
+    subgraph "On-Site Infrastructure"
+        direction TB
         {camera_group}
         {nvr_node}
-        {ai_training}
-        {ai_inference}
-        {dashboard}
-        {alert_system}
+        {internet}
     end
     
-{ai_modules_subgraph}    {nvr_connection}
-    AI_Training -->|Trained Models| AI_Inference
-    AI_Inference -->|Detection Results| Dashboard
-    AI_Inference -->|Alerts| Alert
-{ai_modules_connections}    style AI_Training fill:#e1f5ff,stroke:#01579b,stroke-width:2px,color:#000000
-    style AI_Inference fill:#81d4fa,stroke:#0277bd,stroke-width:2px,color:#000000
-    style Dashboard fill:#fff4e1,stroke:#e65100,stroke-width:2px,color:#000000
-    style Alert fill:#f3e5f5,stroke:#7b1fa2,stroke-width:2px,color:#000000
-    style Cameras fill:#ffffff,stroke:#424242,stroke-width:2px,color:#000000
-    classDef aiModuleStyle fill:#f5f5f5,stroke:#616161,stroke-width:2px,color:#000000
-{ai_modules_styles}
-"""
-        return template
+    subgraph "On-Cloud"
+        direction LR
+        subgraph "Cloud Infrastructure"
+            direction TB
+            {cloud_inference}
+        end
+        
+        subgraph "Output Services"
+            direction TB
+            {dashboard}
+            {alert_system}
+        end
+    end
+    
+    {hse_manager}
+    
+{ai_modules_subgraph}{nvr_connection}
+    Internet --> Cloud_Inference
+    Cloud_Inference --> Dashboard
+    HSE_Manager --> Dashboard
+{ai_modules_connections}    style Cloud_Inference fill:#81d4fa,stroke:#0277bd,stroke-width:3px,color:#000000
+    {OUTPUT_STYLES}
+    style HSE_Manager fill:#e3f2fd,stroke:#1976d2,stroke-width:2px,color:#000000
+    style Internet {STYLE_NETWORK}
+    style Cameras {STYLE_CAMERAS}
+{nvr_style}    classDef aiModuleStyle {STYLE_AI_MODULE}
+{ai_modules_styles}""")
     
     def generate_cloud(self):
         """Generate Cloud Architecture Diagram matching KB examples - compact format"""
-        num_cameras = self.info.get('num_cameras', 8)
-        ai_modules = self.info.get('ai_modules', [])
+        info = self.info
+        num_cameras = info.get('num_cameras', 8)
+        ai_modules = info.get('ai_modules', ())
         # Cloud deployment: Show NVR if include_nvr = true
-        include_nvr = self.info.get('include_nvr', False)
-        list_ai_modules = self.info.get('list_ai_modules', True)
-        compact_mode = self.info.get('compact_mode', True)  # Default to compact mode
+        include_nvr = info.get('include_nvr', False)
+        list_ai_modules = info.get('list_ai_modules', True)
+        compact_mode = info.get('compact_mode', True)  # Default to compact mode
         
         # On-site components - match KB format
         camera_group = f'Cameras["Up to {num_cameras} Cameras<br/>IP-based Camera"]'
         
         # Internet connection - only show type if specified
-        internet_type = self.info.get('internet_type')
+        internet_type = info.get('internet_type')
         if internet_type:
             internet = f'Internet["Internet Connection<br/>({internet_type})<br/>(Provided by Client)"]'
         else:
@@ -168,38 +357,16 @@ class ArchitectureGenerator:
         
         # Cloud components - NO Cloud Training (removed)
         # AI Modules: embed inline in Cloud Inference node if compact_mode
-        if compact_mode and ai_modules:
-            ai_modules_text = self._format_ai_modules_inline(ai_modules)
-            cloud_inference = f'Cloud_Inference["On-cloud in AWS<br/>(viAct\'s CMP)<br/>{ai_modules_text}"]'
-            ai_modules_subgraph = ''
-            ai_modules_connections = ''
-            ai_modules_styles = ''
-        else:
-            cloud_inference = 'Cloud_Inference["On-cloud in AWS<br/>(viAct\'s CMP - Cloud Processing)"]'
-            # AI Modules - list all with full names, arranged horizontally (optional)
-            ai_modules_subgraph = ''
-            ai_modules_connections = ''
-            if list_ai_modules and ai_modules:
-                module_list = []
-                for i, module in enumerate(ai_modules, 1):
-                    module_name = module.strip()
-                    node_id = f'Mod_{i}'
-                    module_list.append(f'{node_id}["{module_name}"]')
-                    ai_modules_connections += f'    Cloud_Inference --> {node_id}\n'
-                
-                ai_modules_nodes = '\n        '.join(module_list)
-                ai_modules_subgraph = f'''    subgraph "AI Modules"
-        direction LR
-        {ai_modules_nodes}
-    end
-    '''
-            ai_modules_styles = self._get_ai_modules_styles(ai_modules) if list_ai_modules and ai_modules else ''
+        (cloud_inference, ai_modules_subgraph, ai_modules_connections,
+         ai_modules_styles) = self._build_ai_block(
+            'Cloud_Inference', 'On-cloud in AWS<br/>(viAct\'s CMP)', ai_modules, compact_mode, list_ai_modules,
+            expanded_label='On-cloud in AWS<br/>(viAct\'s CMP - Cloud Processing)')
         
         # Output Services - grouped together in separate subgraph
         dashboard = 'Dashboard["Centralized Dashboard"]'
         
         # Alert system - match KB format
-        alerts = self.info.get('alert_methods', ['Email', 'Dashboard'])
+        alerts = info.get('alert_methods')
         alert_list = ' & '.join(alerts) if alerts else 'Email & Dashboard'
         alert_system = f'Alert["Alert/Notification<br/>({alert_list})"]'
         
@@ -211,59 +378,69 @@ class ArchitectureGenerator:
         # Output Services xếp thành cột dọc (direction TB)
         # HSE Manager nằm trên cùng hàng ngang nhưng ở cuối cùng, trỏ vào Output Services
         # Từ Cloud Infrastructure sang Output Services: 1 mũi tên từ chính giữa khối này sang chính giữa khối kia
-        nvr_style = '    style NVR fill:#f5f5f5,stroke:#616161,stroke-width:2px,color:#000000\n' if include_nvr else ''
-        
-        template = f"""graph LR
-    subgraph "On-Site Infrastructure"
-        direction TB
+        nvr_style = f'    style NVR {_STYLE_AI_MODULE}\n' if include_nvr else ''
+        
+        return _fill(self._CLOUD_PARTS, {
+            'camera_group': camera_group,
+            'nvr_node': nvr_node,
+            'internet': internet,
+            'cloud_inference': cloud_inference,
+            'dashboard': dashboard,
+            'alert_system': alert_system,
+            'hse_manager': hse_manager,
+            'ai_modules_subgraph': ai_modules_subgraph,
+            'nvr_connection': nvr_connection,
+            'ai_modules_connections': ai_modules_connections,
+            'nvr_style': nvr_style,
+            'ai_modules_styles': ai_modules_styles,
+        })
+    
+    _HYBRID_PARTS = _compile_template("""graph TB
+    subgraph "On-Premise Infrastructure"
         {camera_group}
         {nvr_node}
+        {ai_inference}
+        {local_dashboard}
         {internet}
     end
     
-    subgraph "On-Cloud"
-        direction LR
-        subgraph "Cloud Infrastructure"
-            direction TB
-            {cloud_inference}
-        end
-        
-        subgraph "Output Services"
-            direction TB
-            {dashboard}
-            {alert_system}
-        end
+    subgraph "Cloud Infrastructure"
+        {cloud_training}
+        {online_dashboard}
+        {alert_system}
     end
     
-    {hse_manager}
-    
-{ai_modules_subgraph}{nvr_connection}
-    Internet --> Cloud_Inference
-    Cloud_Inference --> Dashboard
-    HSE_Manager --> Dashboard
-{ai_modules_connections}    style Cloud_Inference fill:#81d4fa,stroke:#0277bd,stroke-width:3px,color:#000000
-    style Dashboard fill:#fff4e1,stroke:#e65100,stroke-width:2px,color:#000000
-    style Alert fill:#f3e5f5,stroke:#7b1fa2,stroke-width:2px,color:#000000
-    style HSE_Manager fill:#e3f2fd,stroke:#1976d2,stroke-width:2px,color:#000000
-    style Internet fill:#e8f5e9,stroke:#2e7d32,stroke-width:2px,color:#000000
-    style Cameras fill:#ffffff,stroke:#424242,stroke-width:2px,color:#000000
-{nvr_style}    classDef aiModuleStyle fill:#f5f5f5,stroke:#616161,stroke-width:2px,color:#000000
-{ai_modules_styles}"""
-        return template
+{ai_modules_subgraph}    {nvr_connection}
+    AI_Inference -->|Detection Results| Local_Dashboard
+    AI_Inference -->|Alerts| Alert
+    Internet -->|Model Updates| Cloud_Training
+    Cloud_Training -.->|Updated Models| AI_Inference
+    AI_Inference -->|API| Online_Dashboard
+{ai_modules_connections}    style AI_Inference {STYLE_AI_INFERENCE}
+    style Local_Dashboard {STYLE_DASHBOARD}
+    style Cloud_Training {STYLE_NETWORK}
+    style Online_Dashboard {STYLE_DASHBOARD}
+    style Alert {STYLE_ALERT}
+    style Cameras {STYLE_CAMERAS}
+    style Internet {STYLE_NETWORK}
+    classDef aiModuleStyle {STYLE_AI_MODULE}
+{ai_modules_styles}
+""")
     
     def generate_hybrid(self):
         """Generate Hybrid Architecture Diagram matching KB examples"""
-        num_cameras = self.info.get('num_cameras', 8)
-        ai_modules = self.info.get('ai_modules', [])
-        show_nvr = self._should_show_nvr()
-        list_ai_modules = self.info.get('list_ai_modules', True)
-        compact_mode = self.info.get('compact_mode', True)
+        info = self.info
+        num_cameras = info.get('num_cameras', 8)
+        ai_modules = info.get('ai_modules', ())
+        show_nvr = self._show_nvr
+        list_ai_modules = info.get('list_ai_modules', True)
+        compact_mode = info.get('compact_mode', True)
         
         # On-site components
         camera_group = f'Cameras["Up to {num_cameras} Cameras<br/>IP-based Camera"]'
         
         # Internet connection - only show type if specified
-        internet_type = self.info.get('internet_type')
+        internet_type = info.get('internet_type')
         if internet_type:
             internet = f'Internet["Internet Connection<br/>({internet_type})"]'
         else:
@@ -280,32 +457,9 @@ class ArchitectureGenerator:
         
         # On-premise AI - clearly label as Inference only (Training is on cloud)
         # AI Modules: embed inline if compact_mode
-        if compact_mode and ai_modules:
-            ai_modules_text = self._format_ai_modules_inline(ai_modules)
-            ai_inference = f'AI_Inference["AI Inference<br/>(On-Premise Processing)<br/>{ai_modules_text}"]'
-            ai_modules_subgraph = ''
-            ai_modules_connections = ''
-            ai_modules_styles = ''
-        else:
-            ai_inference = 'AI_Inference["AI Inference<br/>(On-Premise Processing)"]'
-            # AI Modules - list all with full names, arranged horizontally (optional)
-            ai_modules_subgraph = ''
-            ai_modules_connections = ''
-            if list_ai_modules and ai_modules:
-                module_list = []
-                for i, module in enumerate(ai_modules, 1):
-                    module_name = module.strip()
-                    node_id = f'Mod_{i}'
-                    module_list.append(f'{node_id}["{module_name}"]')
-                    ai_modules_connections += f'    AI_Inference --> {node_id}\n'
-                
-                ai_modules_nodes = '\n        '.join(module_list)
-                ai_modules_subgraph = f'''    subgraph "AI Modules"
-        direction LR
-        {ai_modules_nodes}
-    end
-    '''
-            ai_modules_styles = self._get_ai_modules_styles(ai_modules) if list_ai_modules and ai_modules else ''
+        (ai_inference, ai_modules_subgraph, ai_modules_connections,
+         ai_modules_styles) = self._build_ai_block(
+            'AI_Inference', 'AI Inference<br/>(On-Premise Processing)', ai_modules, compact_mode, list_ai_modules)
         
         local_dashboard = 'Local_Dashboard["Local Dashboard"]'
         
@@ -314,50 +468,62 @@ class ArchitectureGenerator:
         online_dashboard = 'Online_Dashboard["Online Dashboard"]'
         
         # Alert system - can be on-premise or cloud, default to cloud for hybrid
-        alerts = self.info.get('alert_methods', ['Email', 'Dashboard'])
+        alerts = info.get('alert_methods')
         alert_list = ' & '.join(alerts) if alerts else 'Email & Dashboard'
         alert_system = f'Alert["Alert/Notification<br/>({alert_list})"]'
         
-        template = f"""graph TB
+        return _fill(self._HYBRID_PARTS, {
+            'camera_group': camera_group,
+            'nvr_node': nvr_node,
+            'ai_inference': ai_inference,
+            'local_dashboard': local_dashboard,
+            'internet': internet,
+            'cloud_training': cloud_training,
+            'online_dashboard': online_dashboard,
+            'alert_system': alert_system,
+            'ai_modules_subgraph': ai_modules_subgraph,
+            'nvr_connection': nvr_connection,
+            'ai_modules_connections': ai_modules_connections,
+            'ai_modules_styles': ai_modules_styles,
+        })
+    
+    _HYBRID_TRAINING_LOCAL_PARTS = _compile_template("""graph TB
     subgraph "On-Premise Infrastructure"
         {camera_group}
         {nvr_node}
+        {ai_training}
         {ai_inference}
-        {local_dashboard}
         {internet}
     end
     
     subgraph "Cloud Infrastructure"
-        {cloud_training}
         {online_dashboard}
         {alert_system}
     end
     
 {ai_modules_subgraph}    {nvr_connection}
-    AI_Inference -->|Detection Results| Local_Dashboard
+    AI_Training -->|Trained Models| AI_Inference
+    AI_Inference -->|Detection Results| Online_Dashboard
     AI_Inference -->|Alerts| Alert
-    Internet -->|Model Updates| Cloud_Training
-    Cloud_Training -.->|Updated Models| AI_Inference
-    AI_Inference -->|API| Online_Dashboard
-{ai_modules_connections}    style AI_Inference fill:#81d4fa,stroke:#0277bd,stroke-width:2px,color:#000000
-    style Local_Dashboard fill:#fff4e1,stroke:#e65100,stroke-width:2px,color:#000000
-    style Cloud_Training fill:#e8f5e9,stroke:#2e7d32,stroke-width:2px,color:#000000
-    style Online_Dashboard fill:#fff4e1,stroke:#e65100,stroke-width:2px,color:#000000
-    style Alert fill:#f3e5f5,stroke:#7b1fa2,stroke-width:2px,color:#000000
-    style Cameras fill:#ffffff,stroke:#424242,stroke-width:2px,color:#000000
-    style Internet fill:#e8f5e9,stroke:#2e7d32,stroke-width:2px,color:#000000
-    classDef aiModuleStyle fill:#f5f5f5,stroke:#616161,stroke-width:2px,color:#000000
+    Internet -->|API| Online_Dashboard
+{ai_modules_connections}    style AI_Training {STYLE_AI_TRAINING}
+    style AI_Inference {STYLE_AI_INFERENCE}
+    style Online_Dashboard {STYLE_DASHBOARD}
+    style Alert {STYLE_ALERT}
+    style Internet {STYLE_NETWORK}
+    style Cameras {STYLE_CAMERAS}
+    classDef aiModuleStyle {STYLE_AI_MODULE}
 {ai_modules_styles}
-"""
-        return template
+""")
     
     def generate_hybrid_training_local(self):
         """Generate Hybrid Architecture (AI Inference + Training at Site, Dashboard Cloud)"""
-        num_cameras = self.info.get('num_cameras', 8)
-        ai_modules = self.info.get('ai_modules', [])
-        show_nvr = self._should_show_nvr()
-        list_ai_modules = self.info.get('list_ai_modules', True)
-        compact_mode = self.info.get('compact_mode', True)
+        info = self.info
+        num_cameras = info.get('num_cameras', 8)
+        ai_modules = info.get('ai_modules', ())
+        show_nvr = self._show_nvr
+        list_ai_modules = info.get('list_ai_modules', True)
+        compact_mode = info.get('compact_mode', True)
         
         camera_group = f'Cameras["Up to {num_cameras} Cameras<br/>IP-based Camera"]'
         
@@ -372,33 +538,12 @@ class ArchitectureGenerator:
         # Both Training and Inference on-premise
         ai_training = 'AI_Training["AI Training<br/>(On-Premise)"]'
         
-        if compact_mode and ai_modules:
-            ai_modules_text = self._format_ai_modules_inline(ai_modules)
-            ai_inference = f'AI_Inference["AI Inference<br/>(On-Premise Processing)<br/>{ai_modules_text}"]'
-            ai_modules_subgraph = ''
-            ai_modules_connections = ''
-            ai_modules_styles = ''
-        else:
-            ai_inference = 'AI_Inference["AI Inference<br/>(On-Premise Processing)"]'
-            ai_modules_subgraph = ''
-            ai_modules_connections = ''
-            if list_ai_modules and ai_modules:
-                module_list = []
-                for i, module in enumerate(ai_modules, 1):
-                    node_id = f'Mod_{i}'
-                    module_list.append(f'{node_id}["{module.strip()}"]')
-                    ai_modules_connections += f'    AI_Inference --> {node_id}\n'
-                
-                ai_modules_nodes = '\n        '.join(module_list)
-                ai_modules_subgraph = f'''    subgraph "AI Modules"
-        direction LR
-        {ai_modules_nodes}
-    end
-    '''
-            ai_modules_styles = self._get_ai_modules_styles(ai_modules) if list_ai_modules and ai_modules else ''
+        (ai_inference, ai_modules_subgraph, ai_modules_connections,
+         ai_modules_styles) = self._build_ai_block(
+            'AI_Inference', 'AI Inference<br/>(On-Premise Processing)', ai_modules, compact_mode, list_ai_modules)
         
         # Internet for dashboard access only
-        internet_type = self.info.get('internet_type')
+        internet_type = info.get('internet_type')
         if internet_type:
             internet = f'Internet["Internet Connection<br/>({internet_type})<br/>Dashboard Access Only"]'
         else:
@@ -407,45 +552,59 @@ class ArchitectureGenerator:
         # Cloud dashboard only
         online_dashboard = 'Online_Dashboard["Online Dashboard<br/>(Cloud)"]'
         
-        alerts = self.info.get('alert_methods', ['Email', 'Dashboard'])
+        alerts = info.get('alert_methods')
         alert_list = ' & '.join(alerts) if alerts else 'Email & Dashboard'
         alert_system = f'Alert["Alert/Notification<br/>({alert_list})"]'
         
-        template = f"""graph TB
-    subgraph "On-Premise Infrastructure"
+        return _fill(self._HYBRID_TRAINING_LOCAL_PARTS, {
+            'camera_group': camera_group,
+            'nvr_node': nvr_node,
+            'ai_training': ai_training,
+            'ai_inference': ai_inference,
+            'internet': internet,
+            'online_dashboard': online_dashboard,
+            'alert_system': alert_system,
+            'ai_modules_subgraph': ai_modules_subgraph,
+            'nvr_connection': nvr_connection,
+            'ai_modules_connections': ai_modules_connections,
+            'ai_modules_styles': ai_modules_styles,
+        })
+    
+    _4G_VPN_BRIDGE_PARTS = _compile_template("""graph TB
+    subgraph "Remote Sites"
         {camera_group}
-        {nvr_node}
-        {ai_training}
-        {ai_inference}
-        {internet}
+        {sim_cards}
     end
     
-    subgraph "Cloud Infrastructure"
-        {online_dashboard}
+    subgraph "Central Infrastructure"
+        {nvr_central}
+        {vpn_bridge}
+        {ai_processing}
+        {dashboard}
         {alert_system}
     end
     
-{ai_modules_subgraph}    {nvr_connection}
-    AI_Training -->|Trained Models| AI_Inference
-    AI_Inference -->|Detection Results| Online_Dashboard
-    AI_Inference -->|Alerts| Alert
-    Internet -->|API| Online_Dashboard
-{ai_modules_connections}    style AI_Training fill:#e1f5ff,stroke:#01579b,stroke-width:2px,color:#000000
-    style AI_Inference fill:#81d4fa,stroke:#0277bd,stroke-width:2px,color:#000000
-    style Online_Dashboard fill:#fff4e1,stroke:#e65100,stroke-width:2px,color:#000000
-    style Alert fill:#f3e5f5,stroke:#7b1fa2,stroke-width:2px,color:#000000
-    style Internet fill:#e8f5e9,stroke:#2e7d32,stroke-width:2px,color:#000000
-    style Cameras fill:#ffffff,stroke:#424242,stroke-width:2px,color:#000000
-    classDef aiModuleStyle fill:#f5f5f5,stroke:#616161,stroke-width:2px,color:#000000
-{ai_modules_styles}
-"""
-        return template
+    Cameras -->|4G/5G RTSP| SIM_Cards
+    SIM_Cards -->|Auto-Register| VPN_Bridge
+    VPN_Bridge -->|VPN Tunnel| NVR_Central
+    NVR_Central -->|RTSP Links| AI_Processing
+    AI_Processing -->|Detection Results| Dashboard
+    AI_Processing -->|Alerts| Alert
+    
+    style Cameras {STYLE_CAMERAS}
+    style SIM_Cards fill:#e3f2fd,stroke:#1976d2,stroke-width:2px,color:#000000
+    style VPN_Bridge fill:#e8f5e9,stroke:#2e7d32,stroke-width:3px,color:#000000
+    style NVR_Central {STYLE_DASHBOARD}
+    style AI_Processing {STYLE_AI_INFERENCE}
+    {OUTPUT_STYLES}
+""")
     
     def generate_4g_vpn_bridge(self):
         """Generate 4G VPN Bridge Architecture"""
-        num_cameras = self.info.get('num_cameras', 5)
-        ai_modules = self.info.get('ai_modules', [])
-        compact_mode = self.info.get('compact_mode', True)
+        info = self.info
+        num_cameras = info.get('num_cameras', 5)
+        ai_modules = info.get('ai_modules', ())
+        compact_mode = info.get('compact_mode', True)
         
         camera_group = f'Cameras["Up to {num_cameras} Cameras<br/>4G/5G Enabled<br/>Auto-Registration"]'
         
@@ -466,46 +625,49 @@ class ArchitectureGenerator:
             ai_processing = 'AI_Processing["AI Processing"]'
         
         dashboard = 'Dashboard["Central Dashboard"]'
-        alerts = self.info.get('alert_methods', ['Email', 'Mobile'])
+        alerts = info.get('alert_methods')
         alert_list = ' & '.join(alerts) if alerts else 'Email & Mobile'
         alert_system = f'Alert["Alert/Notification<br/>({alert_list})"]'
         
-        template = f"""graph TB
-    subgraph "Remote Sites"
-        {camera_group}
-        {sim_cards}
+        return _fill(self._4G_VPN_BRIDGE_PARTS, {
+            'camera_group': camera_group,
+            'sim_cards': sim_cards,
+            'nvr_central': nvr_central,
+            'vpn_bridge': vpn_bridge,
+            'ai_processing': ai_processing,
+            'dashboard': dashboard,
+            'alert_system': alert_system,
+        })
+    
+    _VIMOV_PARTS = _compile_template("""graph TB
+    subgraph "Mobile Site"
+        {cameras}
+        {mobile_ai}
     end
     
-    subgraph "Central Infrastructure"
-        {nvr_central}
-        {vpn_bridge}
-        {ai_processing}
+    subgraph "Cloud (Optional)"
+        {cloud_sync}
         {dashboard}
         {alert_system}
     end
     
-    Cameras -->|4G/5G RTSP| SIM_Cards
-    SIM_Cards -->|Auto-Register| VPN_Bridge
-    VPN_Bridge -->|VPN Tunnel| NVR_Central
-    NVR_Central -->|RTSP Links| AI_Processing
-    AI_Processing -->|Detection Results| Dashboard
-    AI_Processing -->|Alerts| Alert
+    Cameras -->|RTSP/WiFi| Mobile_AI
+    Mobile_AI -->|Detection Results| Alert
+    Mobile_AI -.->|Sync (When Online)| Cloud_Sync
+    Cloud_Sync -->|Data| Dashboard
     
-    style Cameras fill:#ffffff,stroke:#424242,stroke-width:2px,color:#000000
-    style SIM_Cards fill:#e3f2fd,stroke:#1976d2,stroke-width:2px,color:#000000
-    style VPN_Bridge fill:#e8f5e9,stroke:#2e7d32,stroke-width:3px,color:#000000
-    style NVR_Central fill:#fff4e1,stroke:#e65100,stroke-width:2px,color:#000000
-    style AI_Processing fill:#81d4fa,stroke:#0277bd,stroke-width:2px,color:#000000
-    style Dashboard fill:#fff4e1,stroke:#e65100,stroke-width:2px,color:#000000
-    style Alert fill:#f3e5f5,stroke:#7b1fa2,stroke-width:2px,color:#000000
-"""
-        return template
+    style Cameras {STYLE_CAMERAS}
+    style Mobile_AI fill:#81d4fa,stroke:#0277bd,stroke-width:3px,color:#000000
+    style Cloud_Sync {STYLE_NETWORK},stroke-dasharray: 5 5
+    {OUTPUT_STYLES}
+""")
     
     def generate_vimov(self):
         """Generate viMov Architecture (Mobile/High Mobility)"""
-        num_cameras = self.info.get('num_cameras', 3)
-        ai_modules = self.info.get('ai_modules', [])
-        compact_mode = self.info.get('compact_mode', True)
+        info = self.info
+        num_cameras = info.get('num_cameras', 3)
+        ai_modules = info.get('ai_modules', ())
+        compact_mode = info.get('compact_mode', True)
         
         # Mobile/portable cameras
         cameras = f'Cameras["Portable/Mobile Cameras<br/>{num_cameras} Units<br/>Battery/Solar Powered"]'
@@ -521,55 +683,50 @@ class ArchitectureGenerator:
         cloud_sync = 'Cloud_Sync["Cloud Sync<br/>(When Internet Available)"]'
         
         dashboard = 'Dashboard["Mobile Dashboard"]'
-        alerts = self.info.get('alert_methods', ['Mobile', 'SMS'])
+        alerts = info.get('alert_methods')
         alert_list = ' & '.join(alerts) if alerts else 'Mobile & SMS'
         alert_system = f'Alert["Alert/Notification<br/>({alert_list})"]'
         
-        template = f"""graph TB
-    subgraph "Mobile Site"
-        {cameras}
-        {mobile_ai}
-    end
+        return _fill(self._VIMOV_PARTS, {
+            'cameras': cameras,
+            'mobile_ai': mobile_ai,
+            'cloud_sync': cloud_sync,
+            'dashboard': dashboard,
+            'alert_system': alert_system,
+        })
     
-    subgraph "Cloud (Optional)"
-        {cloud_sync}
-        {dashboard}
-        {alert_system}
-    end
-    
-    Cameras -->|RTSP/WiFi| Mobile_AI
-    Mobile_AI -->|Detection Results| Alert
-    Mobile_AI -.->|Sync (When Online)| Cloud_Sync
-    Cloud_Sync -->|Data| Dashboard
-    
-    style Cameras fill:#ffffff,stroke:#424242,stroke-width:2px,color:#000000
-    style Mobile_AI fill:#81d4fa,stroke:#0277bd,stroke-width:3px,color:#000000
-    style Cloud_Sync fill:#e8f5e9,stroke:#2e7d32,stroke-width:2px,color:#000000,stroke-dasharray: 5 5
-    style Dashboard fill:#fff4e1,stroke:#e65100,stroke-width:2px,color:#000000
-    style Alert fill:#f3e5f5,stroke:#7b1fa2,stroke-width:2px,color:#000000
-"""
-        return template
+    # Deployment method (lowercased) -> generator method name.
+    # 'hybrid' defaults to AI Inference at site, Training + Dashboard Cloud.
+    _DISPATCH = {
+        'on-prem': 'generate_on_prem',
+        'on-premise': 'generate_on_prem',
+        'cloud': 'generate_cloud',
+        'hybrid': 'generate_hybrid',
+        'hybrid-training-local': 'generate_hybrid_training_local',
+        'hybrid-training-onprem': 'generate_hybrid_training_local',
+        '4g-vpn-bridge': 'generate_4g_vpn_bridge',
+        '4g_vpn_bridge': 'generate_4g_vpn_bridge',
+        'vimov': 'generate_vimov',
+    }
     
     def generate(self):
-        """Generate architecture based on deployment method"""
-        method = self.info.get('deployment_method', 'on-prem').lower()
-        
-        if method == 'on-prem' or method == 'on-premise':
-            return self.generate_on_prem()
-        elif method == 'cloud':
-            return self.generate_cloud()
-        elif method == 'hybrid':
-            # Check if training is local or cloud
-            # Default: AI Inference at site, Training + Dashboard Cloud
-            return self.generate_hybrid()
-        elif method == 'hybrid-training-local' or method == 'hybrid-training-onprem':
-            return self.generate_hybrid_training_local()
-        elif method == '4g-vpn-bridge' or method == '4g_vpn_bridge':
-            return self.generate_4g_vpn_bridge()
-        elif method == 'vimov':
-            return self.generate_vimov()
-        else:
+        """Generate architecture based on deployment method (memoized)"""
+        key = _diagram_key(self.info)
+        try:
+            hash(key)
+        except TypeError:
+            # Unhashable field values (e.g. nested lists) - build uncached
+            return self._generate()
+        return _generate_cached(key)
+    
+    def _generate(self):
+        """Dispatch to the generator for the deployment method"""
+        method = self.info.get('deployment_method', 'on-prem')
+        
+        name = self._DISPATCH.get(method)
+        if name is None:
             raise ValueError(f"Unknown deployment method: {method}")
+        return getattr(self, name)()
 
 
 if __name__ == "__main__":
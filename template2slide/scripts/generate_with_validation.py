@@ -7,7 +7,7 @@ Combines Subagent 1 (Generate) and Subagent 2 (Validate) in iterative loop
 import sys
 import json
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 
 # Add script directory to path
 sys.path.insert(0, str(Path(__file__).parent))
@@ -17,36 +17,90 @@ from template2slide import generate_architecture, map_to_slides, generate_powerp
 from subagent2_validate import validate_slides, print_validation_report, ValidationResult
 
 
-def subagent1_generate(template_file: Path, output_dir: Path) -> Dict[str, Any]:
+# Resumable stages of Subagent 1, in order; a retry may resume from a later
+# one. PowerPoint generation is not listed: it always runs, since validation
+# only checks the slide structure and never implicates it on its own
+STAGES = ('architecture', 'mapping')
+
+# Validation categories that implicate the architecture stage (or the whole
+# run); errors in any other category only concern the slide mapping
+ARCHITECTURE_ERROR_CATEGORIES = frozenset({'architecture', 'validation'})
+
+# Section separator, built once; multi-line headers are emitted with a
+# single print() so each costs one write
+_BANNER = "=" * 80
+
+
+def _file_fingerprint(path: Path) -> Tuple[int, int]:
+    """Cheap change detector for a stage input (mtime_ns, size)"""
+    st = path.stat()
+    return st.st_mtime_ns, st.st_size
+
+
+def choose_resume_stage(validation_result: ValidationResult) -> str:
+    """
+    Pick the earliest stage a retry has to re-run, based on which categories
+    the validation errors fall into.
+    """
+    categories = {e.category for e in validation_result.errors}
+    if not categories or categories & ARCHITECTURE_ERROR_CATEGORIES:
+        return 'architecture'
+    return 'mapping'
+
+
+def subagent1_generate(
+    template_file: Path,
+    output_dir: Path,
+    resume_from: str = 'architecture',
+    previous: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
     """
     Subagent 1: Generate slides from template
     
+    Args:
+        resume_from: First stage to run ('architecture' or 'mapping').
+            Earlier stages reuse the outputs recorded in `previous`.
+        previous: Result dict of the previous successful run
+    
     Returns:
         Dict with paths to generated files
     """
-    print("\n" + "="*80)
-    print("SUBAGENT 1: GENERATING SLIDES")
-    print("="*80)
+    print(f"\n{_BANNER}\nSUBAGENT 1: GENERATING SLIDES\n{_BANNER}")
+    
+    # Stages can only be skipped if their outputs exist and the template
+    # has not changed since they were produced
+    if previous is None or previous.get('template_fingerprint') != _file_fingerprint(template_file):
+        resume_from = 'architecture'
+    start = STAGES.index(resume_from)
     
     try:
         # Step 1: Generate architecture
-        arch_file, project_info = generate_architecture(template_file, output_dir)
+        if start <= STAGES.index('architecture'):
+            arch_file, project_info = generate_architecture(template_file, output_dir)
+        else:
+            arch_file, project_info = Path(previous['architecture_file']), previous['project_info']
+            print(f"♻️  Reusing architecture diagram: {arch_file}")
         
         if not arch_file:
             raise Exception("Architecture generation failed")
         
         # Step 2: Map to slides
-        structure_file = map_to_slides(template_file, arch_file, output_dir)
+        if start <= STAGES.index('mapping'):
+            structure_file = map_to_slides(template_file, arch_file, output_dir)
+        else:
+            structure_file = Path(previous['structure_file'])
+            print(f"♻️  Reusing slide structure: {structure_file}")
         
         if not structure_file:
             raise Exception("Slide mapping failed")
         
-        # Step 3: Generate PowerPoint (optional, may require manual step)
+        # Step 3: Generate PowerPoint (optional, may require manual step); always re-run
         pptx_file = generate_powerpoint(structure_file, output_dir)
         
         # Convert Path objects to strings for return
         return {
             'success': True,
+            'template_fingerprint': _file_fingerprint(template_file),
             'architecture_file': str(arch_file) if arch_file else None,
             'project_info': project_info,
             'structure_file': str(structure_file) if structure_file else None,
@@ -68,9 +122,7 @@ def subagent2_validate(template_file: Path, structure_file: Path) -> ValidationR
     Returns:
         ValidationResult with errors and warnings
     """
-    print("\n" + "="*80)
-    print("SUBAGENT 2: VALIDATING SLIDES")
-    print("="*80)
+    print(f"\n{_BANNER}\nSUBAGENT 2: VALIDATING SLIDES\n{_BANNER}")
     
     try:
         result = validate_slides(str(template_file), str(structure_file))
@@ -120,26 +172,26 @@ def generate_slides_with_validation(
     
     output_dir.mkdir(parents=True, exist_ok=True)
     
-    print("="*80)
-    print("SLIDE GENERATION WITH VALIDATION LOOP")
-    print("="*80)
-    print(f"Template: {template_file}")
-    print(f"Output: {output_dir}")
-    print(f"Max Iterations: {max_iterations}")
-    print("="*80)
+    print(
+        f"{_BANNER}\nSLIDE GENERATION WITH VALIDATION LOOP\n{_BANNER}\n"
+        f"Template: {template_file}\n"
+        f"Output: {output_dir}\n"
+        f"Max Iterations: {max_iterations}\n"
+        f"{_BANNER}"
+    )
     
     iteration = 0
     all_results = []
+    resume_from = 'architecture'
+    generate_result = None
     
     while iteration < max_iterations:
         iteration += 1
         
-        print(f"\n{'='*80}")
-        print(f"ITERATION {iteration}/{max_iterations}")
-        print(f"{'='*80}\n")
+        print(f"\n{_BANNER}\nITERATION {iteration}/{max_iterations}\n{_BANNER}\n")
         
         # Step 1: Generate slides (Subagent 1)
-        generate_result = subagent1_generate(template_file, output_dir)
+        generate_result = subagent1_generate(template_file, output_dir, resume_from, generate_result)
         
         if not generate_result.get('success'):
             error_msg = generate_result.get('error', 'Unknown error')
@@ -211,8 +263,9 @@ def generate_slides_with_validation(
                 }
             }
         
-        # Continue to next iteration
-        print(f"\n⚠️  Validation failed. Retrying... (iteration {iteration + 1}/{max_iterations})")
+        # Continue to next iteration, re-running only the stages the errors point at
+        resume_from = choose_resume_stage(validation_result)
+        print(f"\n⚠️  Validation failed. Retrying from '{resume_from}' stage... (iteration {iteration + 1}/{max_iterations})")
         
         # Optional: Attempt auto-fix
         if auto_fix:
@@ -249,9 +302,7 @@ def main():
         )
         
         # Print summary
-        print("\n" + "="*80)
-        print("FINAL SUMMARY")
-        print("="*80)
+        print(f"\n{_BANNER}\nFINAL SUMMARY\n{_BANNER}")
         print(f"Success: {'✅ YES' if result['success'] else '❌ NO'}")
         print(f"Iterations: {result['iterations']}")
         
@@ -267,7 +318,7 @@ def main():
                 print(f"   - Errors: {final_val.get('errors', 0)}")
                 print(f"   - Warnings: {final_val.get('warnings', 0)}")
         
-        print("="*80)
+        print(_BANNER)
         
         # Exit with appropriate code
         sys.exit(0 if result['success'] else 1)
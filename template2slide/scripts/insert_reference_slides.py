@@ -13,20 +13,26 @@ This script:
 """
 
 import sys
-import json
-import shutil
+import os
+import re
 from pathlib import Path
 from copy import deepcopy
 
 try:
     from pptx import Presentation
     from pptx.util import Inches, Pt
+    from pptx.oxml.ns import qn
+    from lxml import etree
     HAS_PPTX = True
 except ImportError:
     HAS_PPTX = False
     print("Error: python-pptx not installed. Install with: pip install python-pptx")
     sys.exit(1)
 
+# Sibling modules resolve via sys.path[0] (this script's directory) when run
+# directly, as generate_from_json.js does
+from output_utils import load_json
+
 
 # Mapping deployment method to slide index in System_architecture.pptx
 DEPLOYMENT_SLIDE_MAP = {
@@ -40,37 +46,62 @@ DEPLOYMENT_SLIDE_MAP = {
     'vimov': None,  # Not in template
 }
 
+# ref directory is in template2slide folder
+_REF_DIR = Path(__file__).parent.parent / "ref"
+
+# Picture references inside copied shapes, compiled once
+_R_EMBED = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}embed"
+_BLIP_XPATH = etree.XPath(".//a:blip[@r:embed]", namespaces={
+    'a': 'http://schemas.openxmlformats.org/drawingml/2006/main',
+    'r': 'http://schemas.openxmlformats.org/officeDocument/2006/relationships',
+})
+
+
+def _list_ref_files():
+    """Map file name -> Path for the regular files in the ref directory"""
+    try:
+        with os.scandir(_REF_DIR) as entries:
+            return {e.name: Path(e.path) for e in entries if e.is_file()}
+    except FileNotFoundError:
+        return {}
+
+
+# Marks the architecture diagram slide (case-insensitive, no per-shape lower())
+ARCHITECTURE_TEXT_RE = re.compile(r'architecture', re.IGNORECASE)
+
+# Normalization rules for free-form deployment method names, checked in order
+DEPLOYMENT_METHOD_RULES = (
+    (lambda m: 'cloud' in m, 'cloud'),
+    # Hybrid with training on-premise
+    (lambda m: 'hybrid' in m and 'training' in m and ('on-prem' in m or 'onprem' in m),
+     'hybrid-training-on-prem'),
+    (lambda m: 'hybrid' in m, 'hybrid'),
+    (lambda m: 'on-prem' in m or 'onprem' in m, 'on-premise'),
+    (lambda m: '4g' in m or 'vpn' in m, '4g-vpn-bridge'),
+    (lambda m: 'vimov' in m, 'vimov'),
+)
+
+
+def _load_project_info(path):
+    """Read project_info from a JSON file (nested or flat layout)"""
+    data = load_json(path)
+    # Handle both nested and flat structures
+    return data['project_info'] if 'project_info' in data else data
+
+
+def _normalize_deployment_method(deployment_method):
+    """Normalize a free-form deployment method name (first matching rule wins)"""
+    for matches, normalized in DEPLOYMENT_METHOD_RULES:
+        if matches(deployment_method):
+            return normalized
+    return deployment_method
+
 
 def get_deployment_method(project_info_path):
     """Extract deployment method from project_info JSON file"""
     try:
-        with open(project_info_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        # Handle both nested and flat structures
-        if 'project_info' in data:
-            project_info = data['project_info']
-        else:
-            project_info = data
-        
-        deployment_method = project_info.get('deployment_method', '').lower()
-        # Normalize deployment method names
-        if 'cloud' in deployment_method:
-            return 'cloud'
-        elif 'hybrid' in deployment_method:
-            # Check if training is on-premise
-            if 'training' in deployment_method and ('on-prem' in deployment_method or 'onprem' in deployment_method):
-                return 'hybrid-training-on-prem'
-            else:
-                return 'hybrid'
-        elif 'on-prem' in deployment_method or 'onprem' in deployment_method:
-            return 'on-premise'
-        elif '4g' in deployment_method or 'vpn' in deployment_method:
-            return '4g-vpn-bridge'
-        elif 'vimov' in deployment_method:
-            return 'vimov'
-        
-        return deployment_method
+        project_info = _load_project_info(project_info_path)
+        return _normalize_deployment_method(project_info.get('deployment_method', '').lower())
     except Exception as e:
         print(f"Warning: Could not read deployment method from {project_info_path}: {e}")
         return None
@@ -87,9 +118,10 @@ def find_architecture_slide_index(presentation):
         try:
             # Check if slide has a title shape
             for shape in slide.shapes:
-                if hasattr(shape, 'text') and 'architecture' in shape.text.lower():
+                text = getattr(shape, 'text', None)
+                if text and ARCHITECTURE_TEXT_RE.search(text):
                     return i
-        except:
+        except Exception:
             pass
     
     # Default: assume architecture slide is around slide 4 (0-indexed: 3)
@@ -97,152 +129,126 @@ def find_architecture_slide_index(presentation):
     return 3
 
 
-def copy_slide_background(source_slide, target_slide):
-    """Copy background from source slide to target slide"""
+def _effective_background(slide):
+    """
+    (<p:bg>, owning part) the slide is drawn with: its own background, else
+    its layout's, else its master's. (None, None) when none of them sets one.
+    """
+    for owner in (slide, slide.slide_layout, slide.slide_layout.slide_master):
+        bg = owner._element.cSld.find(qn('p:bg'))
+        if bg is not None:
+            return bg, owner.part
+    return None, None
+
+
+def _background_key(slide):
+    """Canonical XML of the slide's effective <p:bg> (None when there is none)"""
+    bg, _ = _effective_background(slide)
+    return None if bg is None else etree.tostring(bg, method='c14n')
+
+
+def copy_slide_background(source_slide, target_slide, source_key=None):
+    """
+    Copy background from source slide to target slide.
+    The source's effective <p:bg> is deep-copied into the target's cSld, with
+    image fills re-related to the target part. Skips the copy when the target
+    already carries the same (image-free) background; pass source_key (from
+    _background_key) to reuse it across many targets.
+    Returns False when there is no background to copy or the copy failed.
+    """
+    source_bg, source_part = _effective_background(source_slide)
+    if source_bg is None:
+        return False
+    if source_key is None:
+        source_key = _background_key(source_slide)
     try:
-        # Get background from source slide
-        source_bg = source_slide.background
-        target_bg = target_slide.background
-        
-        # Copy background fill
-        if source_bg.fill:
-            target_bg.fill = deepcopy(source_bg.fill)
+        target_cSld = target_slide._element.cSld
+        target_bg = target_cSld.find(qn('p:bg'))
+        # Same XML only means the same background when no rIds are involved
+        if (target_bg is not None and not _BLIP_XPATH(source_bg)
+                and etree.tostring(target_bg, method='c14n') == source_key):
+            return True
         
-        # Copy background image if exists
-        # Note: Background images are stored in slide relationships
-        # This is a simplified approach - full implementation would need to handle relationships
+        new_bg = deepcopy(source_bg)
+        for blip in _BLIP_XPATH(new_bg):
+            old_rel = source_part.rels[blip.get(_R_EMBED)]
+            blip.set(_R_EMBED, target_slide.part.rels.get_or_add(old_rel.reltype, old_rel._target))
+        # <p:bg> must be the first child of <p:cSld>
+        if target_bg is not None:
+            target_cSld.remove(target_bg)
+        target_cSld.insert(0, new_bg)
         return True
     except Exception as e:
         print(f"Warning: Could not copy background: {e}")
         return False
 
 
-def duplicate_slide(pres, source_index):
+def _insert_shape_elements(sp_tree, shape_elements):
+    """Insert shape elements before p:extLst (or at the end) in one slice assignment"""
+    ext_lst = sp_tree.find(qn('p:extLst'))
+    if ext_lst is None:
+        sp_tree.extend(shape_elements)
+    else:
+        idx = sp_tree.index(ext_lst)
+        sp_tree[idx:idx] = shape_elements
+
+
+def _clone_slide(source_slide, target_pres):
     """
-    Duplicate a slide in the presentation (based on rearrange.py).
-    Returns the new slide.
+    Append a copy of source_slide to target_pres (same or another
+    presentation) using the source slide's layout. Returns the new slide.
     """
-    import six
-    
-    source = pres.slides[source_index]
-    
-    # Use source's layout to preserve formatting
-    new_slide = pres.slides.add_slide(source.slide_layout)
+    new_slide = target_pres.slides.add_slide(source_slide.slide_layout)
     
     # Collect all image and media relationships from the source slide
-    image_rels = {}
-    for rel_id, rel in six.iteritems(source.part.rels):
-        if "image" in rel.reltype or "media" in rel.reltype:
-            image_rels[rel_id] = rel
+    image_rels = {
+        rel_id: rel for rel_id, rel in source_slide.part.rels.items()
+        if "image" in rel.reltype or "media" in rel.reltype
+    }
     
     # CRITICAL: Clear placeholder shapes to avoid duplicates
-    for shape in list(new_slide.shapes):
-        try:
-            sp = shape.element
-            sp.getparent().remove(sp)
-        except:
-            pass
+    new_sp_tree = new_slide.shapes._spTree
+    for sp in list(new_sp_tree.iter_shape_elms()):
+        new_sp_tree.remove(sp)
     
-    # Copy all shapes from source
-    for shape in source.shapes:
-        try:
-            el = shape.element
-            new_el = deepcopy(el)
-            new_slide.shapes._spTree.insert_element_before(new_el, "p:extLst")
-            
-            # Handle picture shapes - need to update the blip reference
-            blips = new_el.xpath(".//a:blip[@r:embed]")
-            for blip in blips:
-                old_rId = blip.get(
-                    "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}embed"
-                )
-                if old_rId in image_rels:
-                    # Create a new relationship in the destination slide for this image
-                    old_rel = image_rels[old_rId]
-                    new_rId = new_slide.part.rels.get_or_add(
-                        old_rel.reltype, old_rel._target
-                    )
-                    # Update the blip's embed reference to use the new relationship ID
-                    blip.set(
-                        "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}embed",
-                        new_rId,
-                    )
-        except Exception as e:
-            print(f"Warning: Could not copy shape: {e}")
-    
-    # Copy background
+    # Copy all shapes from source: one native deepcopy of the whole shape
+    # tree, then move its shape elements across (avoids building a shape
+    # proxy and a separate copy per shape)
     try:
-        source_bg = source.background
-        target_bg = new_slide.background
+        _insert_shape_elements(new_sp_tree, list(deepcopy(source_slide.shapes._spTree).iter_shape_elms()))
         
-        if source_bg.fill:
-            target_bg.fill = deepcopy(source_bg.fill)
+        # Handle picture shapes - update all blip references in one pass
+        for blip in _BLIP_XPATH(new_sp_tree):
+            old_rId = blip.get(_R_EMBED)
+            if old_rId in image_rels:
+                # Create a new relationship in the destination slide for this image
+                old_rel = image_rels[old_rId]
+                new_rId = new_slide.part.rels.get_or_add(old_rel.reltype, old_rel._target)
+                # Update the blip's embed reference to use the new relationship ID
+                blip.set(_R_EMBED, new_rId)
     except Exception as e:
-        print(f"Warning: Could not copy background: {e}")
+        print(f"Warning: Could not copy shapes: {e}")
+    
+    # Copy background
+    copy_slide_background(source_slide, new_slide)
     
     return new_slide
 
 
+def duplicate_slide(pres, source_index):
+    """
+    Duplicate a slide in the presentation (based on rearrange.py).
+    Returns the new slide.
+    """
+    return _clone_slide(pres.slides[source_index], pres)
+
+
 def copy_slide_from_other_pres(source_pres, source_index, target_pres):
     """
     Copy a slide from source presentation to target presentation.
     Returns the new slide.
     """
-    import six
-    
-    source_slide = source_pres.slides[source_index]
-    
-    # Use source slide's layout
-    new_slide = target_pres.slides.add_slide(source_slide.slide_layout)
-    
-    # Collect all image and media relationships from the source slide
-    image_rels = {}
-    for rel_id, rel in six.iteritems(source_slide.part.rels):
-        if "image" in rel.reltype or "media" in rel.reltype:
-            image_rels[rel_id] = rel
-    
-    # Clear existing shapes (placeholders)
-    for shape in list(new_slide.shapes):
-        try:
-            sp = shape.element
-            sp.getparent().remove(sp)
-        except:
-            pass
-    
-    # Copy all shapes from source slide
-    for shape in source_slide.shapes:
-        try:
-            el = shape.element
-            new_el = deepcopy(el)
-            new_slide.shapes._spTree.insert_element_before(new_el, "p:extLst")
-            
-            # Handle picture shapes - update blip references
-            blips = new_el.xpath(".//a:blip[@r:embed]")
-            for blip in blips:
-                old_rId = blip.get(
-                    "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}embed"
-                )
-                if old_rId in image_rels:
-                    old_rel = image_rels[old_rId]
-                    new_rId = new_slide.part.rels.get_or_add(old_rel.reltype, old_rel._target)
-                    blip.set(
-                        "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}embed",
-                        new_rId,
-                    )
-        except Exception as e:
-            print(f"Warning: Could not copy shape: {e}")
-    
-    # Copy background
-    try:
-        source_bg = source_slide.background
-        target_bg = new_slide.background
-        
-        if source_bg.fill:
-            target_bg.fill = deepcopy(source_bg.fill)
-    except Exception as e:
-        print(f"Warning: Could not copy background: {e}")
-    
-    return new_slide
+    return _clone_slide(source_pres.slides[source_index], target_pres)
 
 
 def insert_reference_slides(generated_pptx_path, project_info_path, output_pptx_path=None):
@@ -275,40 +281,26 @@ def insert_reference_slides(generated_pptx_path, project_info_path, output_pptx_
     else:
         output_pptx_path = Path(output_pptx_path)
     
-    # Paths to reference files
-    script_dir = Path(__file__).parent
-    ref_dir = script_dir.parent / "ref"  # ref directory is in template2slide folder
-    system_arch_path = ref_dir / "System_architecture.pptx"
+    # Paths to reference files: one directory read instead of a stat per candidate
+    ref_files = _list_ref_files()
+    system_arch_path = ref_files.get("System_architecture.pptx")
     # Try both possible file names
-    available_slides_path = ref_dir / "AvailableSlide11.pptx"
-    if not available_slides_path.exists():
-        available_slides_path = ref_dir / "Available _Slide.pptx"
+    available_slides_path = ref_files.get("AvailableSlide11.pptx") or ref_files.get("Available _Slide.pptx")
     
-    if not system_arch_path.exists():
-        print(f"Warning: System_architecture.pptx not found at {system_arch_path}")
-        system_arch_path = None
+    if system_arch_path is None:
+        print(f"Warning: System_architecture.pptx not found at {_REF_DIR / 'System_architecture.pptx'}")
     
-    if not available_slides_path.exists():
-        print(f"Warning: Available _Slide.pptx not found at {available_slides_path}")
-        available_slides_path = None
+    if available_slides_path is None:
+        print(f"Warning: Available _Slide.pptx not found at {_REF_DIR / 'Available _Slide.pptx'}")
     
-    # Load presentations
+    # Load presentation once; the package is read fully into memory, so it is
+    # safe to save over the input file, and no working copy is needed
     print(f"Loading generated presentation: {generated_pptx}")
-    generated_pres = Presentation(str(generated_pptx))
+    pres = Presentation(str(generated_pptx))
     
-    total_slides_before = len(generated_pres.slides)
+    total_slides_before = len(pres.slides)
     print(f"Original presentation has {total_slides_before} slides")
     
-    # Create a copy for output
-    if output_pptx_path != generated_pptx:
-        shutil.copy2(generated_pptx, output_pptx_path)
-        pres = Presentation(str(output_pptx_path))
-    else:
-        # Create a temporary file to work with
-        temp_path = generated_pptx.parent / f"{generated_pptx.stem}_temp.pptx"
-        shutil.copy2(generated_pptx, temp_path)
-        pres = Presentation(str(temp_path))
-    
     # Load reference presentations
     system_arch_pres = None
     available_pres = None
@@ -355,19 +347,17 @@ def insert_reference_slides(generated_pptx_path, project_info_path, output_pptx_
         print(f"\nStep 3: Inserting Available slides 11-25 after last slide")
         # Get background from first generated slide (slide 0) to apply to inserted slides
         source_bg_slide = pres.slides[0] if len(pres.slides) > 0 else None
+        # Serialize the source background once, not once per inserted slide
+        source_bg_key = _background_key(source_bg_slide) if source_bg_slide else None
         
         for i in range(10, 25):  # Slides 11-25 (indices 10-24)
             new_slide = copy_slide_from_other_pres(available_pres, i, pres)
             # Copy background from generated slides to inserted slide
             if source_bg_slide:
-                try:
-                    source_bg = source_bg_slide.background
-                    target_bg = new_slide.background
-                    if source_bg.fill:
-                        target_bg.fill = deepcopy(source_bg.fill)
+                if copy_slide_background(source_bg_slide, new_slide, source_bg_key):
                     print(f"  ✓ Copied Available slide {i + 1} (with background from generated slides)")
-                except Exception as e:
-                    print(f"  ✓ Copied Available slide {i + 1} (background copy failed: {e})")
+                else:
+                    print(f"  ✓ Copied Available slide {i + 1} (background not copied)")
             else:
                 print(f"  ✓ Copied Available slide {i + 1}")
         print(f"  ✓ All Available slides 11-25 copied")
@@ -399,43 +389,24 @@ def insert_reference_slides(generated_pptx_path, project_info_path, output_pptx_
     # Get current slide elements as a list
     slide_elements = list(slides)
     
-    # Track current positions as we move slides (indices change after each move)
-    current_positions = {i: i for i in range(len(slide_elements))}
-    
-    for source_idx, target_idx in all_reorders:
-        if source_idx < len(slide_elements):
-            # Get the actual current position of this slide (may have changed due to previous moves)
-            actual_source = current_positions.get(source_idx, source_idx)
-            if actual_source >= len(slides):
-                continue
-                
-            slide_element = slides[actual_source]
-            
-            # Remove from current position
-            slides.remove(slide_element)
-            
-            # Insert at target position
-            insert_pos = min(target_idx, len(slides))
-            slides.insert(insert_pos, slide_element)
-            
-            # Update positions: all slides that were after the source position move back by 1
-            # All slides that are at or after the target position move forward by 1
-            for pos in current_positions:
-                if current_positions[pos] > actual_source:
-                    current_positions[pos] -= 1
-                if current_positions[pos] >= insert_pos:
-                    current_positions[pos] += 1
-            current_positions[source_idx] = insert_pos
-            
-            print(f"  ✓ Moved slide from position {source_idx + 1} to position {target_idx + 1}")
+    # Work out the final order on plain indices first: take the moved slides
+    # out, then insert each at its target position (ascending targets, so
+    # earlier moves are not displaced by later ones)
+    moves = [(source_idx, target_idx) for source_idx, target_idx in all_reorders
+             if source_idx < len(slide_elements)]
+    moved = {source_idx for source_idx, _ in moves}
+    final_order = [i for i in range(len(slide_elements)) if i not in moved]
+    for source_idx, target_idx in moves:
+        final_order.insert(min(target_idx, len(final_order)), source_idx)
+        print(f"  ✓ Moved slide from position {source_idx + 1} to position {target_idx + 1}")
+    
+    # Rebuild sldIdLst in one pass: appending an existing child moves it
+    if moves:
+        for i in final_order:
+            slides.append(slide_elements[i])
     
     # Save final presentation
-    if output_pptx_path == generated_pptx:
-        pres.save(str(generated_pptx))
-        if temp_path.exists():
-            temp_path.unlink()
-    else:
-        pres.save(str(output_pptx_path))
+    pres.save(str(output_pptx_path))
     
     total_slides_after = len(pres.slides)
     print(f"\n✓ Complete! Presentation now has {total_slides_after} slides (was {total_slides_before})")
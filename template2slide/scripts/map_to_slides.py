@@ -4,90 +4,358 @@ Map proposal template (markdown) to slide structure (JSON)
 Converts TEMPLATE.md sections to slide-by-slide structure following SLIDE_TEMPLATE.md
 """
 
+import os
 import sys
-import json
 import re
+import functools
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 
-# Try to use markdown parser for better accuracy, fallback to regex if not available
-try:
-    import markdown
-    from markdown.extensions import codehilite, fenced_code
-    HAS_MARKDOWN = True
-except ImportError:
-    HAS_MARKDOWN = False
+# Sibling modules resolve via sys.path[0] (this script's directory) when run
+# directly, and via the orchestrator's path setup when imported
+from output_utils import dumps_json
 
-# Pre-compile regex patterns for better performance
+# Pre-compile regex patterns for better performance; each is bound to its own
+# module-level name so hot paths do a single global lookup
+
+# Section headers
+_SECTION_HEADER_RE = re.compile(r'^##\s+(.+?)(?:\s*---)?\s*$', re.MULTILINE)
+# Separator lines (---) and empty lines, removed from section bodies in one pass;
+# same result as substituting ^---\s*\n? first and ^\s*\n+ afterwards
+_SECTION_CLEANUP_RE = re.compile(r'^---\s*\n?|^\s*\n+', re.MULTILINE)
+
+# Sub-section headers (### Subsection Name)
+_SUBSECTION_HEADER_RE = re.compile(r'^###\s+(.+?)$', re.MULTILINE)
+
+# Project name extraction
+_TITLE_HEADING_RE = re.compile(r'^#\s+(.+?)$', re.MULTILINE)
+_TECHNICAL_PROPOSAL_RE = re.compile(r'Technical\s+Proposal.*$', re.IGNORECASE)
+
+# Key-value pairs - unified pattern supporting both formats
+_TABLE_ROW_RE = re.compile(r'\|\s*\*\*(.+?)\*\*\s*\|\s*(.+?)\s*\|')
+_KEY_MARKER_COLON_INSIDE_RE = re.compile(r'\*\*([^:]+?):\*\*\s*', re.MULTILINE)
+_KEY_MARKER_COLON_OUTSIDE_RE = re.compile(r'\*\*([^:]+?)\*\*:\s*', re.MULTILINE)
+_SOURCE_REFERENCE_RE = re.compile(r'\*\*Source[:\s]*.*$', re.IGNORECASE)
+_SEPARATOR_IN_VALUE_RE = re.compile(r'\n\s*---\s*(\n|$)', re.MULTILINE)
+_TRAILING_SEPARATOR_RE = re.compile(r'\n\s*---\s*$', re.MULTILINE)
+_NUMBERED_LIST_RE = re.compile(r'^\d+\.\s+', re.MULTILINE)
+_NEWLINES_RE = re.compile(r'\n+')
+_WORK_SCOPE_RE = re.compile(r'\*\*Work Scope\*\*[:\s]+(.+?)(?:\n\n|\n\*\*|$)', re.IGNORECASE | re.DOTALL)
+_FIELD_VALUE_BOLD_RE = re.compile(r':\*\*\s*(.+)$')
+_FIELD_VALUE_PLAIN_RE = re.compile(r':\s*(.+)$')
+
+# Date extraction - unified pattern
+_DATE_PATTERN_RE = re.compile(r'\*\*Date(?:\*\*[:\s]+|:\*\*\s*)(\d{4}-\d{2}-\d{2}|\w+\s+\d{4})', re.IGNORECASE)
+
+# Client name extraction - unified pattern
+_CLIENT_NAME_PATTERN1_RE = re.compile(r'\*\*Project Owner:\*\*\s*(.+?)(?:\n|$)', re.IGNORECASE)
+_CLIENT_NAME_PATTERN2_RE = re.compile(r'\*\*Project Owner\*\*[:\s]+(.+?)(?:\n|$)', re.IGNORECASE)
+_CLIENT_NAME_PATTERN3_RE = re.compile(r'\*\*Client Name:\*\*\s*(.+?)(?:\n|$)', re.IGNORECASE)
+
+# Module extraction - unified patterns
+# One alternation for the three header formats (### 7.1 Name, ### Module 1: Name,
+# **Module 1: Name**); the named group that matched tells the format apart
+_MODULE_HEADER_ANY_RE = re.compile(
+    r'(?P<section_num>^###\s+\d+\.\d+\s+(?P<section_num_name>.+?)(?:\s*\([^)]+\))?\s*$)'
+    r'|(?P<hash>^###\s+Module(?:\s+\d+)?\s*:\s*(?P<hash_name>.+?)$)'
+    r'|(?P<bold>\*\*Module\s+(?:\d+)?:\s*(?P<bold_name>.+?)\*\*)',
+    re.IGNORECASE | re.MULTILINE)
+_MODULE_HEADER_PLAIN_RE = re.compile(r'(?:Module|Module Name)[:\s]+(.+?)(?:\n|$)', re.IGNORECASE | re.MULTILINE)
+_MODULE_TYPE_IN_HEADER_RE = re.compile(r'\(([^)]+)\s*Module[^)]*\)', re.IGNORECASE)
+_TRAILING_PARENTHETICAL_RE = re.compile(r'\s*\([^)]+\)\s*$')
+
+# Module fields - unified pattern
+_MODULE_TYPE_RE = re.compile(r'\*\*Module Type(?::\*\*|\*\*:)\s*(.+?)(?:\n|$)', re.IGNORECASE)
+_FIELD_MARKER_RE = re.compile(r'(?:•\s*|-\s*)?\*\*([^:]+?)(?::\*\*|\*\*:)\s*(.*)$', re.MULTILINE)
+
+# Timeline extraction - unified patterns
+_TIMELINE_PHASE_PATTERN1_RE = re.compile(r'\*\*Phase\s+(T\d+):\s*([^*\n]+?)\*\*', re.IGNORECASE | re.MULTILINE)
+# Formats 2 and 3 are scanned anchor-then-slice (see _scan_phase_blocks): find the
+# header, then the next stop marker, instead of a lazy body with a lookahead
+# tested at every character
+_TIMELINE_PHASE_PATTERN2_RE = re.compile(r'\*\*Phase\s+(T\d+):\*\*(\s*)', re.IGNORECASE)
+_TIMELINE_PHASE_PATTERN2_STOP_RE = re.compile(r'\*\*Phase|\*\*Total|---', re.IGNORECASE)
+_TIMELINE_PHASE_PATTERN3_RE = re.compile(r'\*\*Phase\s+(T\d+)\*\*:(\s*)', re.IGNORECASE)
+_TIMELINE_PHASE_PATTERN3_STOP_RE = re.compile(r'\n\*\*Phase|\n\*\*Total|\n---', re.IGNORECASE)
+_NEXT_PHASE_RE = re.compile(r'\*\*Phase\s+T\d+', re.IGNORECASE)
+_NEXT_DURATION_RE = re.compile(r'\*\*Total Duration', re.IGNORECASE)
+_NEXT_SEPARATOR_RE = re.compile(r'\n\s*---\s*\n', re.IGNORECASE)
+_TIMELINE_DATE_FORMAT1_RE = re.compile(r'(T\d+)\s*=\s*T\d+\s*\+\s*(.+?)(?:\n|$|\)|,|\.)', re.IGNORECASE)
+_TIMELINE_DATE_FORMAT2_RE = re.compile(r'\(?\s*T\d+\s*\+\s*(.+?)\s*\)?', re.IGNORECASE)
+_TIMELINE_DURATION_RE = re.compile(r'(\d+\s*[-–]\s*\d+|\d+)\s*(weeks?|days?|months?)', re.IGNORECASE)
+_DURATION_LINE_RE = re.compile(r'[-*•]?\s*Duration:\s*([^\n]+)', re.IGNORECASE)
+_TRAILING_PUNCT_RE = re.compile(r'[.,;]$')
+
+# Architecture subsections that count as a detailed description
+_DETAILED_DESCRIPTION_RE = re.compile(r'###\s+.*(?:Description|Data Flow|Components)', re.IGNORECASE)
+
+# Module categories for grouping, in priority order (a "Safety Helmet" module is
+# PPE Detection); names are lower-cased before matching
+_MODULE_CATEGORY_RES = (
+    ("PPE Detection", re.compile(r'helmet|vest|glove|boot|ppe')),
+    ("Safety", re.compile(r'safety|unsafe|danger')),
+    ("Operations", re.compile(r'count|queue|process')),
+)
+
+# Mermaid diagram extraction
+_MERMAID_CODE_BLOCK1_RE = re.compile(r'```mermaid\s*\n(.*?)\n```', re.DOTALL)
+_MERMAID_CODE_BLOCK2_RE = re.compile(r'```mermaid\s*\n(.*?)```', re.DOTALL)
+
+# Placeholder validation
+_PLACEHOLDER_PATTERN_RE = re.compile(r'\[([A-Z_]+_\d+)\]')
+
+# Bullet points
+_BULLET_MARKER_RE = re.compile(r'^\s*[-*•]\s*', re.MULTILINE)
+_LEADING_BULLET_RE = re.compile(r'^[-*•]\s*')
+_NESTED_BULLET_2_RE = re.compile(r'^\s{2}[-*•]\s+', re.MULTILINE)
+_NESTED_BULLET_4_RE = re.compile(r'^\s{4}[-*•]\s+', re.MULTILINE)
+
+# Cleanup patterns
+_BOLD_MARKERS_RE = re.compile(r'\*\*')
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# Name-keyed view of the patterns above, kept for importers (subagent2_validate)
 REGEX_PATTERNS = {
-    # Section headers
-    'section_header': re.compile(r'^##\s+(.+?)(?:\s*---)?\s*$', re.MULTILINE),
-    'separator_line': re.compile(r'^---\s*\n?', re.MULTILINE),
-    'leading_empty_lines': re.compile(r'^\s*\n+', re.MULTILINE),
-    
-    # Project name extraction
-    'title_heading': re.compile(r'^#\s+(.+?)$', re.MULTILINE),
-    'technical_proposal': re.compile(r'Technical\s+Proposal.*$', re.IGNORECASE),
-    
-    # Key-value pairs - unified pattern supporting both formats
-    'table_row': re.compile(r'\|\s*\*\*(.+?)\*\*\s*\|\s*(.+?)\s*\|'),
-    'key_marker_colon_inside': re.compile(r'\*\*([^:]+?):\*\*\s*', re.MULTILINE),
-    'key_marker_colon_outside': re.compile(r'\*\*([^:]+?)\*\*:\s*', re.MULTILINE),
-    'source_reference': re.compile(r'\*\*Source[:\s]*.*$', re.IGNORECASE),
-    'separator_in_value': re.compile(r'\n\s*---\s*(\n|$)', re.MULTILINE),
-    'trailing_separator': re.compile(r'\n\s*---\s*$', re.MULTILINE),
-    'numbered_list': re.compile(r'^\d+\.\s+', re.MULTILINE),
-    'newlines': re.compile(r'\n+'),
-    
-    # Date extraction - unified pattern
-    'date_pattern': re.compile(r'\*\*Date(?:\*\*[:\s]+|:\*\*\s*)(\d{4}-\d{2}-\d{2}|\w+\s+\d{4})', re.IGNORECASE),
-    
-    # Client name extraction - unified pattern
-    'client_name_pattern1': re.compile(r'\*\*Project Owner:\*\*\s*(.+?)(?:\n|$)', re.IGNORECASE),
-    'client_name_pattern2': re.compile(r'\*\*Project Owner\*\*[:\s]+(.+?)(?:\n|$)', re.IGNORECASE),
-    'client_name_pattern3': re.compile(r'\*\*Client Name:\*\*\s*(.+?)(?:\n|$)', re.IGNORECASE),
-    
-    # Module extraction - unified patterns
-    # Pattern for ### 7.1, ### 7.2, etc. (section number format)
-    'module_header_section_num': re.compile(r'^###\s+\d+\.\d+\s+(.+?)(?:\s*\([^)]+\))?\s*$', re.IGNORECASE | re.MULTILINE),
-    'next_module_section_num': re.compile(r'^###\s+\d+\.\d+\s+', re.IGNORECASE | re.MULTILINE),
-    'module_header_hash': re.compile(r'^###\s+Module(?:\s+\d+)?\s*:\s*(.+?)$', re.IGNORECASE | re.MULTILINE),
-    'module_header_bold': re.compile(r'\*\*Module\s+(?:\d+)?:\s*(.+?)\*\*', re.IGNORECASE),
-    'module_header_plain': re.compile(r'(?:Module|Module Name)[:\s]+(.+?)(?:\n|$)', re.IGNORECASE | re.MULTILINE),
-    'next_module_hash': re.compile(r'^###\s+Module(?:\s+\d+)?\s*:\s*', re.IGNORECASE | re.MULTILINE),
-    'next_module_bold': re.compile(r'\*\*Module\s+(?:\d+)?:\s*', re.IGNORECASE),
-    
-    # Module fields - unified pattern
-    'module_type': re.compile(r'\*\*Module Type(?::\*\*|\*\*:)\s*(.+?)(?:\n|$)', re.IGNORECASE),
-    'field_marker': re.compile(r'(?:•\s*|-\s*)?\*\*([^:]+?)(?::\*\*|\*\*:)\s*(.*)$', re.MULTILINE),
-    
-    # Timeline extraction - unified patterns
-    'timeline_phase_pattern1': re.compile(r'\*\*Phase\s+(T\d+):\s*([^*\n]+?)\*\*', re.IGNORECASE | re.MULTILINE),
-    'timeline_phase_pattern2': re.compile(r'\*\*Phase\s+(T\d+):\*\*\s*(.+?)(?=\*\*Phase|\*\*Total|---|\Z)', re.IGNORECASE | re.DOTALL),
-    'timeline_phase_pattern3': re.compile(r'\*\*Phase\s+(T\d+)\*\*:\s*(.+?)(?=\n\*\*Phase|\n\*\*Total|\n---|\Z)', re.IGNORECASE | re.MULTILINE | re.DOTALL),
-    'next_phase': re.compile(r'\*\*Phase\s+T\d+', re.IGNORECASE),
-    'next_duration': re.compile(r'\*\*Total Duration', re.IGNORECASE),
-    'next_separator': re.compile(r'\n\s*---\s*\n', re.IGNORECASE),
-    'timeline_date_format1': re.compile(r'(T\d+)\s*=\s*T\d+\s*\+\s*(.+?)(?:\n|$|\)|,|\.)', re.IGNORECASE),
-    'timeline_date_format2': re.compile(r'\(?\s*T\d+\s*\+\s*(.+?)\s*\)?', re.IGNORECASE),
-    'timeline_duration': re.compile(r'(\d+\s*[-–]\s*\d+|\d+)\s*(weeks?|days?|months?)', re.IGNORECASE),
-    
-    # Mermaid diagram extraction
-    'mermaid_code_block1': re.compile(r'```mermaid\s*\n(.*?)\n```', re.DOTALL),
-    'mermaid_code_block2': re.compile(r'```mermaid\s*\n(.*?)```', re.DOTALL),
-    
-    # Placeholder validation
-    'placeholder_pattern': re.compile(r'\[([A-Z_]+_\d+)\]'),
+    'section_header': _SECTION_HEADER_RE,
+    'section_cleanup': _SECTION_CLEANUP_RE,
+    'subsection_header': _SUBSECTION_HEADER_RE,
+    'title_heading': _TITLE_HEADING_RE,
+    'technical_proposal': _TECHNICAL_PROPOSAL_RE,
+    'table_row': _TABLE_ROW_RE,
+    'key_marker_colon_inside': _KEY_MARKER_COLON_INSIDE_RE,
+    'key_marker_colon_outside': _KEY_MARKER_COLON_OUTSIDE_RE,
+    'source_reference': _SOURCE_REFERENCE_RE,
+    'separator_in_value': _SEPARATOR_IN_VALUE_RE,
+    'trailing_separator': _TRAILING_SEPARATOR_RE,
+    'numbered_list': _NUMBERED_LIST_RE,
+    'newlines': _NEWLINES_RE,
+    'work_scope': _WORK_SCOPE_RE,
+    'field_value_bold': _FIELD_VALUE_BOLD_RE,
+    'field_value_plain': _FIELD_VALUE_PLAIN_RE,
+    'date_pattern': _DATE_PATTERN_RE,
+    'client_name_pattern1': _CLIENT_NAME_PATTERN1_RE,
+    'client_name_pattern2': _CLIENT_NAME_PATTERN2_RE,
+    'client_name_pattern3': _CLIENT_NAME_PATTERN3_RE,
+    'module_header_any': _MODULE_HEADER_ANY_RE,
+    'module_header_plain': _MODULE_HEADER_PLAIN_RE,
+    'module_type_in_header': _MODULE_TYPE_IN_HEADER_RE,
+    'trailing_parenthetical': _TRAILING_PARENTHETICAL_RE,
+    'module_type': _MODULE_TYPE_RE,
+    'field_marker': _FIELD_MARKER_RE,
+    'timeline_phase_pattern1': _TIMELINE_PHASE_PATTERN1_RE,
+    'timeline_phase_pattern2': _TIMELINE_PHASE_PATTERN2_RE,
+    'timeline_phase_pattern2_stop': _TIMELINE_PHASE_PATTERN2_STOP_RE,
+    'timeline_phase_pattern3': _TIMELINE_PHASE_PATTERN3_RE,
+    'timeline_phase_pattern3_stop': _TIMELINE_PHASE_PATTERN3_STOP_RE,
+    'next_phase': _NEXT_PHASE_RE,
+    'next_duration': _NEXT_DURATION_RE,
+    'next_separator': _NEXT_SEPARATOR_RE,
+    'timeline_date_format1': _TIMELINE_DATE_FORMAT1_RE,
+    'timeline_date_format2': _TIMELINE_DATE_FORMAT2_RE,
+    'timeline_duration': _TIMELINE_DURATION_RE,
+    'duration_line': _DURATION_LINE_RE,
+    'trailing_punct': _TRAILING_PUNCT_RE,
+    'detailed_description': _DETAILED_DESCRIPTION_RE,
+    'mermaid_code_block1': _MERMAID_CODE_BLOCK1_RE,
+    'mermaid_code_block2': _MERMAID_CODE_BLOCK2_RE,
+    'placeholder_pattern': _PLACEHOLDER_PATTERN_RE,
+    'bullet_marker': _BULLET_MARKER_RE,
+    'leading_bullet': _LEADING_BULLET_RE,
+    'nested_bullet_2': _NESTED_BULLET_2_RE,
+    'nested_bullet_4': _NESTED_BULLET_4_RE,
+    'bold_markers': _BOLD_MARKERS_RE,
+    'whitespace': _WHITESPACE_RE,
+}
+
+
+
+def _scan_phase_blocks(content: str, header_re: re.Pattern, stop_re: re.Pattern) -> List[Tuple[str, str, int]]:
+    """
+    Find "**Phase Tn...**" blocks whose body runs up to the next stop marker
+    (or end of content). header_re captures the phase id and the whitespace
+    after the header. Returns (phase, body, end offset) tuples, matching what a
+    lazy DOTALL body with a stop-marker lookahead would capture.
+    """
+    blocks = []
+    end = len(content)
+    pos = 0
+    while True:
+        header = header_re.search(content, pos)
+        if not header:
+            return blocks
+        body_start = header.end()
+        if body_start < end:
+            # Body is at least one character; a stop marker ends it after that
+            stop = stop_re.search(content, body_start + 1)
+            body_end = stop.start() if stop else end
+        elif header.end(2) > header.start(2):
+            # Nothing after the header but whitespace: the body is its last character
+            body_start, body_end = end - 1, end
+        else:
+            pos = header.start() + 1
+            continue
+        blocks.append((header.group(1), content[body_start:body_end], body_end))
+        pos = body_end
+
+
+def _strip_list_marker(line: str) -> str:
+    """
+    Strip a leading "<digits>." number, then a leading -, * or • bullet, each
+    with the whitespace after it (same as re.sub(r'^\d+\.\s*') followed by
+    re.sub(r'^[-*•]\s*'), without running the regex engine per line).
+    """
+    i = 0
+    while i < len(line) and line[i].isdecimal():
+        i += 1
+    if i and line[i:i + 1] == '.':
+        line = line[i + 1:].lstrip()
+    if line[:1] in ('-', '*', '•'):
+        line = line[1:].lstrip()
+    return line
+
+
+# Module fields returned by SlideMapper._extract_module_fields (besides "type")
+MODULE_FIELD_KEYS = (
+    "purpose", "alert_logic", "preconditions", "detection_criteria",
+    "data_requirements", "image_url", "video_url",
+)
+_URL_FIELD_KEYS = frozenset({"image_url", "video_url"})
+
+
+@functools.lru_cache(maxsize=256)
+def _module_field_key(field_name: str) -> Optional[str]:
+    """
+    Map a module field label (e.g. "Alert Trigger Logic") to its key in
+    MODULE_FIELD_KEYS, or None for labels that are not collected. Templates
+    reuse the same handful of labels, so the checks run once per label.
+    """
+    field_lower = field_name.lower()
+    if ('purpose' in field_lower and 'description' in field_lower) or field_lower == 'purpose':
+        return "purpose"
+    if 'alert trigger logic' in field_lower or 'alert logic' in field_lower:
+        return "alert_logic"
+    if 'preconditions' in field_lower:
+        return "preconditions"
+    if 'detection criteria' in field_lower:
+        return "detection_criteria"
+    if 'image url' in field_lower:
+        return "image_url"
+    if 'video url' in field_lower:
+        return "video_url"
+    if 'data requirements' in field_lower:
+        return "data_requirements"
+    return None
+
+
+def _clean_field_value(value_lines: List[str]) -> str:
+    """Join a field's lines into one line: collapse whitespace, drop ** markers"""
+    return ' '.join('\n'.join(value_lines).split()).replace('**', '').strip()
+
+
+# System Requirements subsections placed on the grouped slides; any other
+# subsection gets a slide of its own
+GROUPED_SYSTEM_REQUIREMENTS = frozenset({
+    "Network", "Camera",
+    "AI Training", "AI Training Workstation",
+    "AI Inference", "AI Inference Workstation",
+    "Dashboard", "Dashboard Workstation",
+})
+
+
+def _extract_project_name(content: str, file_path: Path) -> str:
+    """Extract project name from proposal"""
+    # Try to find from title or first heading
+    match = _TITLE_HEADING_RE.search(content)
+    if match:
+        title = match.group(1).strip()
+        # Remove "Technical Proposal" or similar
+        title = _TECHNICAL_PROPOSAL_RE.sub('', title).strip()
+        return title
+
+    # Fallback to filename
+    return file_path.stem
+
+
+def _extract_sections(content: str) -> Dict[str, str]:
+    """Extract sections from markdown (## Section Name headers)"""
+    sections = {}
+    section_header = _SECTION_HEADER_RE
+
+    # Find header candidates with str.find (lines starting with "##") and
+    # only run the header pattern at those offsets, instead of letting
+    # finditer attempt a match at every character of the document
+    matches = []
+    pos = 0 if content.startswith('##') else content.find('\n##')
+    while pos != -1:
+        if content[pos] == '\n':
+            pos += 1
+        match = section_header.match(content, pos)
+        if match:
+            matches.append(match)
+            pos = match.end()
+        pos = content.find('\n##', pos)
+
+    for i, match in enumerate(matches):
+        section_name = match.group(1).strip()
+        start_pos = match.end()
+
+        # Find end position (next section or end of file)
+        if i + 1 < len(matches):
+            end_pos = matches[i + 1].start()
+        else:
+            end_pos = len(content)
+
+        section_content = content[start_pos:end_pos].strip()
+        # Remove separator lines (---) and empty lines - using pre-compiled pattern
+        section_content = _SECTION_CLEANUP_RE.sub('', section_content)
+        sections[section_name] = section_content
+
+    return sections
+
+
+# Parse results per file version (absolute path, mtime_ns, size), so a template
+# parsed again in the same process - e.g. by map_to_slides and subagent2_validate
+# on every validation-loop iteration - is not re-scanned
+@functools.lru_cache(maxsize=128)
+def _parse_proposal(path: str, mtime_ns: int, size: int) -> Dict[str, Any]:
+    """
+    Read and parse a proposal file. mtime_ns and size are only part of the
+    cache key, so an edited file is parsed again.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        content = f.read()
+    return {
+        # Extract project name
+        "project_name": _extract_project_name(content, Path(path)),
+        # Extract sections
+        "sections": _extract_sections(content)
+    }
+
+
+def clear_parse_cache() -> None:
+    """Drop all cached ProposalParser.parse() results and diagram reads"""
+    _parse_proposal.cache_clear()
+    _load_mermaid_code.cache_clear()
+
+
+@functools.lru_cache(maxsize=32)
+def _load_mermaid_code(path: str, mtime_ns: int, size: int) -> Optional[str]:
+    """
+    Read a diagram file and return its mermaid code block, or None if it has
+    none. mtime_ns and size are only part of the cache key, so an edited file
+    is read again.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        content = f.read()
     
-    # Bullet points
-    'bullet_marker': re.compile(r'^\s*[-*•]\s*', re.MULTILINE),
-    'nested_bullet_2': re.compile(r'^\s{2}[-*•]\s+', re.MULTILINE),
-    'nested_bullet_4': re.compile(r'^\s{4}[-*•]\s+', re.MULTILINE),
+    # Extract mermaid code block - try multiple patterns using pre-compiled patterns
+    match = _MERMAID_CODE_BLOCK1_RE.search(content)
+    if not match:
+        match = _MERMAID_CODE_BLOCK2_RE.search(content)
     
-    # Cleanup patterns
-    'bold_markers': re.compile(r'\*\*'),
-    'whitespace': re.compile(r'\s+'),
-}
+    if match:
+        return match.group(1).strip() or None
+    return None
 
 
 class ProposalParser:
@@ -103,6 +371,9 @@ class ProposalParser:
         """Read markdown file"""
         try:
             with open(self.file_path, 'r', encoding='utf-8') as f:
+                # Version key for the parse cache, taken from the handle that is read
+                st = os.fstat(f.fileno())
+                self._cache_key = (os.path.abspath(self.file_path), st.st_mtime_ns, st.st_size)
                 return f.read()
         except Exception as e:
             print(f"Error reading file: {e}")
@@ -110,8 +381,10 @@ class ProposalParser:
     
     def _validate_no_placeholders(self) -> None:
         """Validate that template has no unresolved placeholders"""
-        placeholders = REGEX_PATTERNS['placeholder_pattern'].findall(self.content)
-        if placeholders:
+        # Common case: no placeholder at all, so no match list is built
+        first = _PLACEHOLDER_PATTERN_RE.search(self.content)
+        if first is not None:
+            placeholders = _PLACEHOLDER_PATTERN_RE.findall(self.content, first.start())
             print("\n" + "="*80)
             print("❌ ERROR: Template contains unresolved placeholders!")
             print("="*80)
@@ -126,64 +399,15 @@ class ProposalParser:
             raise ValueError(f"Template contains {len(placeholders)} unresolved placeholders. Please resolve them first.")
     
     def parse(self) -> Dict[str, Any]:
-        """Parse proposal and extract sections"""
-        # Extract project name
-        project_name = self._extract_project_name()
-        
-        # Extract sections
-        sections = self._extract_sections()
+        """Parse proposal and extract sections (cached per file version)"""
+        parsed = _parse_proposal(*self._cache_key)
         
+        # Callers get their own sections dict; the cached one stays untouched
         return {
-            "project_name": project_name,
-            "sections": sections
+            "project_name": parsed["project_name"],
+            "sections": dict(parsed["sections"])
         }
     
-    def _extract_project_name(self) -> str:
-        """Extract project name from proposal"""
-        # Try to find from title or first heading
-        match = REGEX_PATTERNS['title_heading'].search(self.content)
-        if match:
-            title = match.group(1).strip()
-            # Remove "Technical Proposal" or similar
-            title = REGEX_PATTERNS['technical_proposal'].sub('', title).strip()
-            return title
-        
-        # Fallback to filename
-        return self.file_path.stem
-    
-    def _extract_sections(self) -> Dict[str, str]:
-        """Extract sections from markdown using improved parsing"""
-        sections = {}
-        
-        # Use markdown parser if available for more accurate parsing
-        if HAS_MARKDOWN:
-            try:
-                md = markdown.Markdown(extensions=['meta', 'fenced_code'])
-                html = md.convert(self.content)
-                # Fallback to regex for section extraction (markdown library doesn't preserve section structure easily)
-            except:
-                pass
-        
-        # Pattern to match section headers (## Section Name) - using pre-compiled pattern
-        matches = list(REGEX_PATTERNS['section_header'].finditer(self.content))
-        
-        for i, match in enumerate(matches):
-            section_name = match.group(1).strip()
-            start_pos = match.end()
-            
-            # Find end position (next section or end of file)
-            if i + 1 < len(matches):
-                end_pos = matches[i + 1].start()
-            else:
-                end_pos = len(self.content)
-            
-            section_content = self.content[start_pos:end_pos].strip()
-            # Remove leading separator lines (---) and empty lines - using pre-compiled patterns
-            section_content = REGEX_PATTERNS['separator_line'].sub('', section_content)
-            section_content = REGEX_PATTERNS['leading_empty_lines'].sub('', section_content)
-            sections[section_name] = section_content
-        
-        return sections
 
 
 class SlideMapper:
@@ -200,36 +424,13 @@ class SlideMapper:
         sections = self.proposal_data["sections"]
         project_name = self.proposal_data["project_name"]
         
-        # Slide 1: Cover Page
-        self._map_cover_page(sections)
-        
-        # Slide 2: Project Requirement Statement
-        self._map_project_requirement(sections)
-        
-        # Slide 3-4: Scope of Work
-        self._map_scope_of_work(sections)
-        
-        # Slide 5-6: System Architecture
-        self._map_system_architecture(sections)
-        
-        # Slide 7-10: System Requirements
-        self._map_system_requirements(sections)
-        
-        # Slide 11-12: Implementation Plan
-        self._map_implementation_plan(sections)
-        
-        # Slide 13-20+: Proposed Modules
-        self._map_proposed_modules(sections)
-        
-        # Slide 21-23: User Interface & Reporting
-        self._map_user_interface(sections)
-        
-        # Extract client name from project requirement
-        client_name = self._extract_client_name(sections)
+        # Section mappers append their slides in deck order (see _MAPPERS)
+        for mapper in self._MAPPERS:
+            mapper(self, sections)
         
         return {
             "project_name": project_name,
-            "client_name": client_name,
+            "client_name": self.client_name,
             "total_slides": len(self.slides),
             "slides": self.slides
         }
@@ -240,10 +441,10 @@ class SlideMapper:
         project_req = sections.get("2. PROJECT REQUIREMENT STATEMENT", "")
         
         # Extract title
-        title = f"Video Analytics Solution Proposal for {self._extract_client_name(sections)}"
+        title = f"Video Analytics Solution Proposal for {self.client_name}"
         
         # Extract date - using unified pre-compiled pattern
-        date_match = REGEX_PATTERNS['date_pattern'].search(cover_page)
+        date_match = _DATE_PATTERN_RE.search(cover_page)
         if date_match:
             date = date_match.group(1)
         else:
@@ -277,20 +478,18 @@ class SlideMapper:
                     line = line.strip()
                     if not line:
                         continue
-                    # Remove leading number and dot if present (e.g., "1. Helmet Detection" -> "Helmet Detection")
-                    line = re.sub(r'^\d+\.\s*', '', line)
-                    # Remove leading bullet markers if present (e.g., "- Helmet Detection" -> "Helmet Detection")
-                    line = re.sub(r'^[-*•]\s*', '', line)
+                    # Remove leading "1." number and "-"/"*"/"•" bullet markers
+                    # (e.g., "1. Helmet Detection" -> "Helmet Detection")
+                    line = _strip_list_marker(line)
                     if line:
                         module_list.append(line)
                 
                 # List each module at level 0 (same level as Project, Project Owner)
                 # Format as "AI Modules: Module1" for first, then just module names for rest
-                for idx, module in enumerate(module_list):
-                    if idx == 0:
-                        content.append({"level": 0, "text": f"{k}: {module}"})
-                    else:
-                        content.append({"level": 0, "text": module})
+                content.extend(
+                    {"level": 0, "text": f"{k}: {module}" if idx == 0 else module}
+                    for idx, module in enumerate(module_list)
+                )
             else:
                 content.append({"level": 0, "text": f"{k}: {v}"})
         
@@ -364,21 +563,9 @@ class SlideMapper:
         # Split into sub-sections
         subsections = self._extract_subsection(section_content)
         
-        # Group related sections: Network, Camera, AI Training, AI Inference, Dashboard
-        related_sections = {
-            "Network": subsections.get("Network", ""),
-            "Camera": subsections.get("Camera", ""),
-            "AI Training": subsections.get("AI Training", ""),
-            "AI Training Workstation": subsections.get("AI Training Workstation", ""),
-            "AI Inference": subsections.get("AI Inference", ""),
-            "AI Inference Workstation": subsections.get("AI Inference Workstation", ""),
-            "Dashboard": subsections.get("Dashboard", ""),
-            "Dashboard Workstation": subsections.get("Dashboard Workstation", "")
-        }
-        
         # Group Network and Camera together on one slide
-        network_content = related_sections.get("Network", "")
-        camera_content = related_sections.get("Camera", "")
+        network_content = subsections.get("Network", "")
+        camera_content = subsections.get("Camera", "")
         
         if network_content or camera_content:
             content = []
@@ -405,9 +592,9 @@ class SlideMapper:
         # - If all fit in one slide (<= 15 items), put all in one slide
         # - If too long, split by complete sections: AI Training + AI Inference in first, Dashboard in second
         # - Never cut a section in the middle
-        ai_training = related_sections.get("AI Training", "") or related_sections.get("AI Training Workstation", "")
-        ai_inference = related_sections.get("AI Inference", "") or related_sections.get("AI Inference Workstation", "")
-        dashboard = related_sections.get("Dashboard", "") or related_sections.get("Dashboard Workstation", "")
+        ai_training = subsections.get("AI Training", "") or subsections.get("AI Training Workstation", "")
+        ai_inference = subsections.get("AI Inference", "") or subsections.get("AI Inference Workstation", "")
+        dashboard = subsections.get("Dashboard", "") or subsections.get("Dashboard Workstation", "")
         
         if ai_training or ai_inference or dashboard:
             # Count total items for each complete section
@@ -416,20 +603,17 @@ class SlideMapper:
             dashboard_items = []
             
             if ai_training:
-                training_bullets = self._format_bullet_points(ai_training)
-                training_items = [{"level": 0, "text": "AI Training"}] + training_bullets
+                training_items = [{"level": 0, "text": "AI Training"}, *self._format_bullet_points(ai_training)]
             if ai_inference:
-                inference_bullets = self._format_bullet_points(ai_inference)
-                inference_items = [{"level": 0, "text": "AI Inference"}] + inference_bullets
+                inference_items = [{"level": 0, "text": "AI Inference"}, *self._format_bullet_points(ai_inference)]
             if dashboard:
-                dashboard_bullets = self._format_bullet_points(dashboard)
-                dashboard_items = [{"level": 0, "text": "Dashboard"}] + dashboard_bullets
+                dashboard_items = [{"level": 0, "text": "Dashboard"}, *self._format_bullet_points(dashboard)]
             
             total_items = len(training_items) + len(inference_items) + len(dashboard_items)
             
             # If total items <= 15, put all in one slide
             if total_items <= 15:
-                content = training_items + inference_items + dashboard_items
+                content = [*training_items, *inference_items, *dashboard_items]
                 if content:
                     self.slides.append({
                         "slide_number": self.slide_number,
@@ -441,7 +625,7 @@ class SlideMapper:
             else:
                 # Split by complete sections: AI Training + AI Inference in first, Dashboard in second
                 # Slide 1: AI Training + AI Inference (complete sections, not cut)
-                content1 = training_items + inference_items
+                content1 = [*training_items, *inference_items]
                 if content1:
                     self.slides.append({
                         "slide_number": self.slide_number,
@@ -462,10 +646,8 @@ class SlideMapper:
                     self.slide_number += 1
         
         # Process remaining subsections (not Network, Camera, AI Training, AI Inference, Dashboard)
-        processed_names = ["Network", "Camera", "AI Training", "AI Training Workstation", 
-                          "AI Inference", "AI Inference Workstation", "Dashboard", "Dashboard Workstation"]
         for subsection_name, subsection_content in subsections.items():
-            if not subsection_content.strip() or subsection_name in processed_names:
+            if not subsection_content.strip() or subsection_name in GROUPED_SYSTEM_REQUIREMENTS:
                 continue
             
             self.slides.append({
@@ -598,12 +780,17 @@ class SlideMapper:
     
     # Helper methods
     
+    @functools.cached_property
+    def client_name(self) -> str:
+        """Client name from the Project Requirement Statement (extracted once per mapper)"""
+        return self._extract_client_name(self.proposal_data["sections"])
+    
     def _extract_client_name(self, sections: Dict[str, str]) -> str:
         """Extract client name from Project Requirement Statement"""
         project_req = sections.get("2. PROJECT REQUIREMENT STATEMENT", "")
         # Try patterns in order using pre-compiled patterns
-        for pattern_name in ['client_name_pattern1', 'client_name_pattern2', 'client_name_pattern3']:
-            match = REGEX_PATTERNS[pattern_name].search(project_req)
+        for pattern in (_CLIENT_NAME_PATTERN1_RE, _CLIENT_NAME_PATTERN2_RE, _CLIENT_NAME_PATTERN3_RE):
+            match = pattern.search(project_req)
             if match:
                 return match.group(1).strip()
         print("\n❌ ERROR: Client Name (Project Owner) not found in template.")
@@ -613,7 +800,7 @@ class SlideMapper:
     
     def _extract_work_scope(self, content: str) -> str:
         """Extract work scope one-liner"""
-        match = re.search(r'\*\*Work Scope\*\*[:\s]+(.+?)(?:\n\n|\n\*\*|$)', content, re.IGNORECASE | re.DOTALL)
+        match = _WORK_SCOPE_RE.search(content)
         if match:
             scope = match.group(1).strip()
             # Take first sentence or first 100 chars
@@ -628,19 +815,19 @@ class SlideMapper:
         pairs = {}
         
         # Method 1: Try table format first (| **Key** | Value |) - using pre-compiled pattern
-        for match in REGEX_PATTERNS['table_row'].finditer(content):
+        for match in _TABLE_ROW_RE.finditer(content):
             key = match.group(1).strip()
             value = match.group(2).strip()
             # Clean value (remove markdown, source references) - using pre-compiled patterns
-            value = REGEX_PATTERNS['source_reference'].sub('', value).strip()
-            value = REGEX_PATTERNS['bold_markers'].sub('', value).strip()
+            value = _SOURCE_REFERENCE_RE.sub('', value).strip()
+            value = _BOLD_MARKERS_RE.sub('', value).strip()
             pairs[key] = value
         
         # Method 2: Try **Key:** Value format (if table format didn't find anything)
         if not pairs:
             # Try both patterns and use whichever finds matches
-            key_markers1 = list(REGEX_PATTERNS['key_marker_colon_inside'].finditer(content))
-            key_markers2 = list(REGEX_PATTERNS['key_marker_colon_outside'].finditer(content)) if not key_markers1 else []
+            key_markers1 = list(_KEY_MARKER_COLON_INSIDE_RE.finditer(content))
+            key_markers2 = list(_KEY_MARKER_COLON_OUTSIDE_RE.finditer(content)) if not key_markers1 else []
             key_markers = key_markers1 if key_markers1 else key_markers2
             
             for i, marker in enumerate(key_markers):
@@ -653,30 +840,29 @@ class SlideMapper:
                 else:
                     end_pos = len(content)
                 
-                # Extract value, but stop at separator (---) if found
-                value_section = content[start_pos:end_pos]
-                separator_match = REGEX_PATTERNS['separator_in_value'].search(value_section)
+                # Extract value, but stop at separator (---) if found; the
+                # separator is searched in place so the value is sliced once
+                separator_match = _SEPARATOR_IN_VALUE_RE.search(content, start_pos, end_pos)
                 if separator_match:
-                    value_section = value_section[:separator_match.start()]
-                
-                value = value_section.strip()
+                    end_pos = separator_match.start()
                 
-                # Remove any trailing separators - using pre-compiled pattern
-                value = REGEX_PATTERNS['trailing_separator'].sub('', value).strip()
+                # No trailing "---" can be left: the first one already ended the value
+                value = content[start_pos:end_pos].strip()
                 
                 # Special handling for list values (like AI Modules)
                 # If value starts with numbered list (1. 2. 3.), keep line breaks
-                if REGEX_PATTERNS['numbered_list'].match(value):
+                if _NUMBERED_LIST_RE.match(value):
                     # Keep as multiline, just clean up extra whitespace
                     lines = [line.strip() for line in value.split('\n') if line.strip()]
                     value = '\n'.join(lines)
                 else:
                     # For non-list values, replace newlines with space - using pre-compiled pattern
-                    value = REGEX_PATTERNS['newlines'].sub(' ', value).strip()
+                    value = _NEWLINES_RE.sub(' ', value).strip()
                 
-                # Clean value - remove trailing source references - using pre-compiled patterns
-                value = REGEX_PATTERNS['source_reference'].sub('', value).strip()
-                value = REGEX_PATTERNS['bold_markers'].sub('', value).strip()
+                # Clean value - remove trailing source references and bold markers;
+                # both start with "**", so values without one need no cleanup
+                if '**' in value:
+                    value = _SOURCE_REFERENCE_RE.sub('', value).replace('**', '').strip()
                 
                 if value:
                     pairs[key] = value
@@ -693,26 +879,33 @@ class SlideMapper:
         3. viAct Responsibilities: (plain text header)
         """
         items = []
-        lines = content.split('\n')
         in_section = False
         
         # Normalize keyword for matching (case-insensitive, handle variations)
         keyword_lower = keyword.lower()
         
-        for i, line in enumerate(lines):
+        # Lower-case the content once; lower() never adds or drops newlines,
+        # so its lines stay aligned with the original ones. Every header
+        # contains the keyword, so nothing before its first occurrence matters.
+        content_lower = content.lower()
+        first = content_lower.find(keyword_lower)
+        if first == -1:
+            return items
+        skip = content_lower.count('\n', 0, first)
+        lines = content.split('\n')[skip:]
+        lower_lines = content_lower.split('\n')[skip:]
+        
+        for line, line_lower in zip(lines, lower_lines):
             line_stripped = line.strip()
-            line_lower = line.lower()
             
             # Check if this line is a header with the keyword
             # Format 1: ### viAct Responsibilities: or ### Client Responsibilities:
             # Format 2: **viAct Responsibilities:** or **Client Responsibilities:**
             # Format 3: viAct Responsibilities: (plain text)
-            is_header = False
-            if keyword_lower in line_lower:
-                if (line_stripped.startswith('###') or 
-                    line_stripped.startswith('**') or
-                    (':' in line_stripped and not line_stripped.startswith('-'))):
-                    is_header = True
+            has_keyword = keyword_lower in line_lower
+            is_header = has_keyword and (
+                line_stripped.startswith(('###', '**')) or
+                (':' in line_stripped and not line_stripped.startswith('-')))
             
             if is_header:
                 in_section = True
@@ -722,7 +915,7 @@ class SlideMapper:
                 # Check if we hit another section header (starts with ### or **)
                 if (line_stripped.startswith('###') or 
                     (line_stripped.startswith('**') and ':' in line_stripped and 
-                     keyword_lower not in line_lower)):
+                     not has_keyword)):
                     break
                 
                 # Skip separator lines (---)
@@ -730,15 +923,13 @@ class SlideMapper:
                     continue
                 
                 # Check if this is a bullet point (supports -, *, •)
-                if (line_stripped.startswith('-') or 
-                    line_stripped.startswith('*') or 
-                    line_stripped.startswith('•')):
+                if line_stripped.startswith(('-', '*', '•')):
                     # Remove bullet marker - using pre-compiled pattern
-                    item = REGEX_PATTERNS['bullet_marker'].sub('', line)
+                    item = _BULLET_MARKER_RE.sub('', line)
                     # Remove markdown bold markers - using pre-compiled pattern
-                    item = REGEX_PATTERNS['bold_markers'].sub('', item).strip()
-                    # Skip if item is just dashes, empty, or separator
-                    if item and not re.match(r'^-+$', item) and item != '---':
+                    item = _BOLD_MARKERS_RE.sub('', item).strip()
+                    # Skip if item is just dashes, empty, or separator (--- included)
+                    if item.strip('-'):
                         items.append(item)
                 # If we hit an empty line after collecting items, continue
                 # (might be spacing between items)
@@ -750,9 +941,8 @@ class SlideMapper:
     def _extract_subsection(self, content: str) -> Dict[str, str]:
         """Extract sub-sections (### Subsection Name)"""
         subsections = {}
-        # Using a simple pattern for subsection headers
-        pattern = re.compile(r'^###\s+(.+?)$', re.MULTILINE)
-        matches = list(pattern.finditer(content))
+        # One pass over the section finds every subsection header
+        matches = list(_SUBSECTION_HEADER_RE.finditer(content))
         
         for i, match in enumerate(matches):
             subsection_name = match.group(1).strip()
@@ -773,25 +963,14 @@ class SlideMapper:
             if not line or line.startswith('|'):
                 continue
             
-            # Determine level - using pre-compiled patterns
-            level = 0
-            if REGEX_PATTERNS['bullet_marker'].match(line):
-                level = 0
-                line = REGEX_PATTERNS['bullet_marker'].sub('', line)
-            elif REGEX_PATTERNS['nested_bullet_2'].match(line):
-                level = 1
-                line = REGEX_PATTERNS['nested_bullet_2'].sub('', line)
-            elif REGEX_PATTERNS['nested_bullet_4'].match(line):
-                level = 2
-                line = REGEX_PATTERNS['nested_bullet_4'].sub('', line)
-            
-            # Clean markdown - using pre-compiled patterns
-            line = REGEX_PATTERNS['bold_markers'].sub('', line)
-            line = REGEX_PATTERNS['source_reference'].sub('', line).strip()
+            # Lines are stripped above, so the indented (nested) bullet patterns
+            # can never match and every item is level 0. Once the bold markers are
+            # gone no "**Source" reference can remain, so that cleanup is skipped
+            line = _LEADING_BULLET_RE.sub('', line).replace('**', '').strip()
             
             if line:
                 bullets.append({
-                    "level": level,
+                    "level": 0,
                     "text": line
                 })
         
@@ -801,37 +980,31 @@ class SlideMapper:
         """Extract timeline milestones with date format: T1 = T0 + x weeks"""
         milestones = []
         
-        # Try patterns in order using pre-compiled patterns
-        matches1 = list(REGEX_PATTERNS['timeline_phase_pattern1'].finditer(content))
-        if not matches1:
-            matches1 = list(REGEX_PATTERNS['timeline_phase_pattern2'].finditer(content))
-        if not matches1:
-            matches1 = list(REGEX_PATTERNS['timeline_phase_pattern3'].finditer(content))
-        
-        for match in matches1:
-            phase = match.group(1).strip()
-            event_name = match.group(2).strip()
+        # Try patterns in order using pre-compiled patterns: (phase, event text, end offset)
+        blocks = [(m.group(1), m.group(2), m.end()) for m in _TIMELINE_PHASE_PATTERN1_RE.finditer(content)]
+        if not blocks:
+            blocks = _scan_phase_blocks(content, _TIMELINE_PHASE_PATTERN2_RE, _TIMELINE_PHASE_PATTERN2_STOP_RE)
+        if not blocks:
+            blocks = _scan_phase_blocks(content, _TIMELINE_PHASE_PATTERN3_RE, _TIMELINE_PHASE_PATTERN3_STOP_RE)
+        
+        for phase, event_name, start_pos in blocks:
+            phase = phase.strip()
+            event_name = event_name.strip()
             
             # Clean event_name - extract just the phase name (e.g., "Hardware Deployment")
             # The event_name might contain the full text including "- Duration:" line
             # Extract only the first line (phase name)
-            phase_name = event_name.split('\n')[0].strip()
-            phase_name = re.sub(r'^[-*•]\s*', '', phase_name).strip()
-            
-            # Find the section content after this phase header
-            start_pos = match.end()
-            # Look for next phase (with **Phase) or end of section - using pre-compiled patterns
-            next_phase = REGEX_PATTERNS['next_phase'].search(content[start_pos:])
-            next_duration = REGEX_PATTERNS['next_duration'].search(content[start_pos:])
-            next_separator = REGEX_PATTERNS['next_separator'].search(content[start_pos:])
+            phase_name = event_name.partition('\n')[0].strip()
+            phase_name = _LEADING_BULLET_RE.sub('', phase_name).strip()
             
-            end_pos = len(content)
-            if next_phase:
-                end_pos = start_pos + next_phase.start()
-            elif next_duration:
-                end_pos = start_pos + next_duration.start()
-            elif next_separator:
-                end_pos = start_pos + next_separator.start()
+            # Find the section content after this phase header (start_pos)
+            # Look for next phase (with **Phase) or end of section - using pre-compiled
+            # patterns searched from start_pos in place (no copy of the remaining text);
+            # later markers are only searched when the earlier ones are absent
+            boundary = (_NEXT_PHASE_RE.search(content, start_pos)
+                        or _NEXT_DURATION_RE.search(content, start_pos)
+                        or _NEXT_SEPARATOR_RE.search(content, start_pos))
+            end_pos = boundary.start() if boundary else len(content)
             
             phase_content = content[start_pos:end_pos]
             
@@ -840,15 +1013,15 @@ class SlideMapper:
             date = ""
             # Pattern: "- Duration:" or "Duration:" followed by duration (e.g., "T0 + 1-2 weeks")
             # Search in event_name first (it might contain the duration line)
-            duration_match = re.search(r'[-*•]?\s*Duration:\s*([^\n]+)', event_name, re.IGNORECASE)
+            duration_match = _DURATION_LINE_RE.search(event_name)
             if not duration_match:
                 # If not in event_name, search in phase_content
-                duration_match = re.search(r'[-*•]?\s*Duration:\s*([^\n]+)', phase_content, re.IGNORECASE)
+                duration_match = _DURATION_LINE_RE.search(phase_content)
             
             if duration_match:
                 duration_text = duration_match.group(1).strip()
                 # Remove trailing punctuation and clean up
-                duration_text = re.sub(r'[.,;]$', '', duration_text).strip()
+                duration_text = _TRAILING_PUNCT_RE.sub('', duration_text).strip()
                 date = duration_text
             elif phase == "T0":
                 date = "T0"
@@ -881,28 +1054,33 @@ class SlideMapper:
         """
         modules = []
         
-        # Pattern 0: ### 7.1, ### 7.2, etc. (section number format like "### 7.1 PPE Detection – Safety Helmet")
-        # Check this first as it's a common format
-        matches0 = list(REGEX_PATTERNS['module_header_section_num'].finditer(content))
-        
-        if matches0:
-            for match in matches0:
-                full_match = match.group(0).strip()
-                module_name = match.group(1).strip()
+        # Patterns 0-2 in one pass, bucketed by format:
+        #   section_num: ### 7.1 PPE Detection – Safety Helmet (checked first, common format)
+        #   hash:        ### Module [number]: [Name] (markdown header format - 3 hashes)
+        #   bold:        **Module [number]: [Name]** (fallback for bold format)
+        # The first format (in that order) with any header wins, as before
+        headers = {'section_num': [], 'hash': [], 'bold': []}
+        for match in _MODULE_HEADER_ANY_RE.finditer(content):
+            headers[match.lastgroup].append(match)
+        kind = next((k for k, found in headers.items() if found), None)
+        
+        if kind:
+            matches = headers[kind]
+            for i, match in enumerate(matches):
+                module_name = match.group(kind + '_name').strip()
                 
                 # Extract module type from parentheses if present (e.g., "(Standard Module)")
                 module_type = ""
-                type_match = re.search(r'\(([^)]+)\s*Module[^)]*\)', full_match, re.IGNORECASE)
-                if type_match:
-                    module_type = type_match.group(1).strip()
-                    # Remove type from module name
-                    module_name = re.sub(r'\s*\([^)]+\)\s*$', '', module_name).strip()
+                if kind == 'section_num':
+                    type_match = _MODULE_TYPE_IN_HEADER_RE.search(match.group(0).strip())
+                    if type_match:
+                        module_type = type_match.group(1).strip()
+                        # Remove type from module name
+                        module_name = _TRAILING_PARENTHETICAL_RE.sub('', module_name).strip()
                 
-                # Extract module details from the section following this module name
+                # Module details run from this header to the next header of the same format
                 start_pos = match.end()
-                # Find the end of this module's section (next module or end of content)
-                next_module = REGEX_PATTERNS['next_module_section_num'].search(content[start_pos:])
-                end_pos = start_pos + next_module.start() if next_module else len(content)
+                end_pos = matches[i + 1].start() if i + 1 < len(matches) else len(content)
                 module_content = content[start_pos:end_pos]
                 
                 # Extract module fields
@@ -921,70 +1099,14 @@ class SlideMapper:
                     "video_url": module_data["video_url"]
                 })
         
-        # Pattern 1: ### Module [number]: [Name] (markdown header format - 3 hashes)
-        # Using pre-compiled pattern
-        if not modules:
-            matches1 = list(REGEX_PATTERNS['module_header_hash'].finditer(content))
-            
-            for match in matches1:
-                module_name = match.group(1).strip()
-            # Extract module details from the section following this module name
-            start_pos = match.end()
-            # Find the end of this module's section (next module or end of content) - using pre-compiled pattern
-            next_module = REGEX_PATTERNS['next_module_hash'].search(content[start_pos:])
-            end_pos = start_pos + next_module.start() if next_module else len(content)
-            module_content = content[start_pos:end_pos]
-            
-            # Extract module fields
-            module_data = self._extract_module_fields(module_content)
-            modules.append({
-                "name": module_name,
-                "type": module_data["type"],
-                "purpose": module_data["purpose"],
-                "alert_logic": module_data["alert_logic"],
-                "preconditions": module_data["preconditions"],
-                "detection_criteria": module_data["detection_criteria"],
-                "data_requirements": module_data["data_requirements"],
-                "image_url": module_data["image_url"],
-                "video_url": module_data["video_url"]
-            })
-        
-        # Pattern 2: **Module [number]: [Name]** (e.g., **Module 1: Safety Helmet Detection**)
-        # Fallback pattern for bold format - using pre-compiled pattern
-        if not modules:
-            matches2 = list(REGEX_PATTERNS['module_header_bold'].finditer(content))
-            
-            for match in matches2:
-                module_name = match.group(1).strip()
-                # Extract module details from the section following this module name
-                start_pos = match.end()
-                # Find the end of this module's section (next module or end of content) - using pre-compiled pattern
-                next_module = REGEX_PATTERNS['next_module_bold'].search(content[start_pos:])
-                end_pos = start_pos + next_module.start() if next_module else len(content)
-                module_content = content[start_pos:end_pos]
-                
-                # Extract module fields
-                module_data = self._extract_module_fields(module_content)
-                modules.append({
-                    "name": module_name,
-                    "type": module_data["type"],
-                    "purpose": module_data["purpose"],
-                    "alert_logic": module_data["alert_logic"],
-                    "preconditions": module_data["preconditions"],
-                    "detection_criteria": module_data["detection_criteria"],
-                    "data_requirements": module_data["data_requirements"],
-                    "image_url": module_data["image_url"],
-                    "video_url": module_data["video_url"]
-                })
-        
         # Pattern 3: Module: [Name] or Module Name: [Name] (fallback for other formats)
         if not modules:
             # Try pattern without ** markers - using pre-compiled pattern
-            matches2 = REGEX_PATTERNS['module_header_plain'].finditer(content)
+            matches2 = _MODULE_HEADER_PLAIN_RE.finditer(content)
             for match in matches2:
                 module_name = match.group(1).strip()
                 # Remove markdown if present - using pre-compiled pattern
-                module_name = REGEX_PATTERNS['bold_markers'].sub('', module_name).strip()
+                module_name = _BOLD_MARKERS_RE.sub('', module_name).strip()
                 if module_name:
                     modules.append({
                         "name": module_name,
@@ -1003,114 +1125,43 @@ class SlideMapper:
     def _extract_module_fields(self, module_content: str) -> Dict[str, str]:
         """Extract module fields from module content section"""
         module_type = ""
-        purpose = ""
-        alert_logic = ""
-        preconditions = ""
-        detection_criteria = ""
-        data_requirements = ""
-        image_url = ""
-        video_url = ""
+        fields = dict.fromkeys(MODULE_FIELD_KEYS, "")
         
         # First, extract Module Type (can be on separate line without bullet)
         # Using pre-compiled pattern
-        module_type_match = REGEX_PATTERNS['module_type'].search(module_content)
+        module_type_match = _MODULE_TYPE_RE.search(module_content)
         if module_type_match:
             module_type = module_type_match.group(1).strip()
         
-        # Use line-by-line parsing to handle empty values correctly
+        # Use line-by-line parsing to handle empty values correctly:
+        # collect (field name, value lines) in order, then store them below
         lines = module_content.split('\n')
-        current_field = None
-        current_value = []
+        entries = []
         
         for line in lines:
             line_stripped = line.strip()
             
             # Check if this line starts a new field - using pre-compiled pattern
-            field_match = REGEX_PATTERNS['field_marker'].match(line_stripped)
+            field_match = _FIELD_MARKER_RE.match(line_stripped)
             if field_match:
-                # Save previous field if exists
-                if current_field:
-                    field_name = current_field
-                    field_value = '\n'.join(current_value).strip()
-                    # Clean up the value - using pre-compiled patterns
-                    field_value = REGEX_PATTERNS['whitespace'].sub(' ', field_value).strip()
-                    field_value = REGEX_PATTERNS['bold_markers'].sub('', field_value).strip()
-                    # Remove trailing separators
-                    field_value = REGEX_PATTERNS['trailing_separator'].sub('', field_value).strip()
-                    # Process this field
-                    field_lower = field_name.lower()
-                    if 'purpose description' in field_lower or ('purpose' in field_lower and 'description' in field_lower) or field_lower == 'purpose':
-                        purpose = field_value
-                    elif 'alert trigger logic' in field_lower or 'alert logic' in field_lower:
-                        alert_logic = field_value
-                    elif 'preconditions' in field_lower:
-                        preconditions = field_value
-                    elif 'detection criteria' in field_lower:
-                        detection_criteria = field_value
-                    elif 'image url' in field_lower:
-                        if field_value and 'http' in field_value.lower():
-                            image_url = field_value
-                        else:
-                            image_url = ""
-                    elif 'video url' in field_lower:
-                        if field_value and 'http' in field_value.lower():
-                            video_url = field_value
-                        else:
-                            video_url = ""
-                    elif 'data requirements' in field_lower or 'client data requirements' in field_lower:
-                        data_requirements = field_value
-                
                 # Start new field
-                current_field = field_match.group(1).strip()
                 initial_value = field_match.group(2).strip()
-                current_value = [initial_value] if initial_value else []
-            else:
-                # Continue current field value (skip empty lines only if we have a field)
-                if current_field:
-                    if line_stripped:
-                        current_value.append(line_stripped)
-        
-        # Process last field
-        if current_field:
-            field_name = current_field
-            field_value = '\n'.join(current_value).strip()
-            field_value = REGEX_PATTERNS['whitespace'].sub(' ', field_value).strip()
-            field_value = REGEX_PATTERNS['bold_markers'].sub('', field_value).strip()
-            # Remove trailing separators
-            field_value = REGEX_PATTERNS['trailing_separator'].sub('', field_value).strip()
-            # Process this field
-            field_lower = field_name.lower()
-            if 'purpose description' in field_lower or ('purpose' in field_lower and 'description' in field_lower) or field_lower == 'purpose':
-                purpose = field_value
-            elif 'alert trigger logic' in field_lower or 'alert logic' in field_lower:
-                alert_logic = field_value
-            elif 'preconditions' in field_lower:
-                preconditions = field_value
-            elif 'detection criteria' in field_lower:
-                detection_criteria = field_value
-            elif 'image url' in field_lower:
-                if field_value and 'http' in field_value.lower():
-                    image_url = field_value
-                else:
-                    image_url = ""
-            elif 'video url' in field_lower:
-                if field_value and 'http' in field_value.lower():
-                    video_url = field_value
-                else:
-                    video_url = ""
-            elif 'data requirements' in field_lower or 'client data requirements' in field_lower:
-                data_requirements = field_value
-        
-        return {
-            "type": module_type,
-            "purpose": purpose,
-            "alert_logic": alert_logic,
-            "preconditions": preconditions,
-            "detection_criteria": detection_criteria,
-            "data_requirements": data_requirements,
-            "image_url": image_url,
-            "video_url": video_url
-        }
+                entries.append((field_match.group(1).strip(), [initial_value] if initial_value else []))
+            elif entries and line_stripped:
+                # Continue current field value (skip empty lines)
+                entries[-1][1].append(line_stripped)
+        
+        # A later field with the same key replaces an earlier one
+        for field_name, value_lines in entries:
+            key = _module_field_key(field_name)
+            if key:
+                field_value = _clean_field_value(value_lines)
+                # URLs are only kept when they look like links
+                if key in _URL_FIELD_KEYS and 'http' not in field_value.lower():
+                    field_value = ""
+                fields[key] = field_value
+        
+        return {"type": module_type, **fields}
     
     def _extract_field_value(self, line: str) -> str:
         """
@@ -1121,20 +1172,20 @@ class SlideMapper:
         - • Field: Value
         """
         # Remove leading bullet markers
-        line = re.sub(r'^[-*•]\s*', '', line.strip())
+        line = _LEADING_BULLET_RE.sub('', line.strip())
         
         # Try to extract value after :** or :
         # Pattern 1: **Field:** Value
-        match = re.search(r':\*\*\s*(.+)$', line)
+        match = _FIELD_VALUE_BOLD_RE.search(line)
         if match:
             return match.group(1).strip()
         
         # Pattern 2: Field: Value
-        match = re.search(r':\s*(.+)$', line)
+        match = _FIELD_VALUE_PLAIN_RE.search(line)
         if match:
             value = match.group(1).strip()
             # Remove remaining markdown
-            value = re.sub(r'\*\*', '', value).strip()
+            value = _BOLD_MARKERS_RE.sub('', value).strip()
             return value
         
         return ""
@@ -1150,21 +1201,23 @@ class SlideMapper:
         
         for module in modules:
             name = module.get("name", "").lower()
-            if any(keyword in name for keyword in ["helmet", "vest", "glove", "boot", "ppe"]):
-                groups["PPE Detection"].append(module)
-            elif any(keyword in name for keyword in ["safety", "unsafe", "danger"]):
-                groups["Safety"].append(module)
-            elif any(keyword in name for keyword in ["count", "queue", "process"]):
-                groups["Operations"].append(module)
-            else:
-                groups["Other"].append(module)
+            # First category (in priority order) with a keyword in the name wins
+            category = next((category for category, keywords in _MODULE_CATEGORY_RES
+                             if keywords.search(name)), "Other")
+            groups[category].append(module)
         
         # Remove empty groups
         return {k: v for k, v in groups.items() if v}
     
     def _is_table_format(self, content: str) -> bool:
         """Check if content is in table format"""
-        return '|' in content and content.count('|') > 3
+        # Stop at the fourth pipe instead of counting every one
+        pos = -1
+        for _ in range(4):
+            pos = content.find('|', pos + 1)
+            if pos == -1:
+                return False
+        return True
     
     def _extract_table_rows(self, content: str) -> List[List[str]]:
         """Extract rows from markdown table"""
@@ -1173,9 +1226,11 @@ class SlideMapper:
         
         for line in lines:
             if '|' in line and not line.strip().startswith('|---'):
-                cells = [cell.strip() for cell in line.split('|')[1:-1]]  # Skip first and last empty
-                if len(cells) >= 2:
-                    rows.append(cells[:2])  # Take first two columns
+                # Only the first two columns are kept, so split no further than
+                # that; a row needs a pipe after its second cell to count
+                parts = line.split('|', 3)
+                if len(parts) == 4:
+                    rows.append([parts[1].strip(), parts[2].strip()])
         
         return rows
     
@@ -1191,23 +1246,17 @@ class SlideMapper:
             diagram_path = diagram_path.resolve()
         
         try:
-            if not diagram_path.exists():
+            try:
+                stat = diagram_path.stat()
+            except (FileNotFoundError, NotADirectoryError):
                 print(f"⚠️  Warning: Architecture diagram file not found: {diagram_path}")
                 return None
             
-            with open(diagram_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            # Extract mermaid code block - try multiple patterns using pre-compiled patterns
-            match = REGEX_PATTERNS['mermaid_code_block1'].search(content)
-            if not match:
-                match = REGEX_PATTERNS['mermaid_code_block2'].search(content)
-            
-            if match:
-                code = match.group(1).strip()
-                if code:
-                    print(f"✅ Extracted mermaid diagram code ({len(code)} chars)")
-                    return code
+            # Cached per file version, so repeated runs in one process skip the read
+            code = _load_mermaid_code(str(diagram_path), stat.st_mtime_ns, stat.st_size)
+            if code:
+                print(f"✅ Extracted mermaid diagram code ({len(code)} chars)")
+                return code
             
             print(f"⚠️  Warning: No mermaid code block found in {diagram_path}")
             return None
@@ -1218,26 +1267,44 @@ class SlideMapper:
     
     def _extract_architecture_description(self, content: str) -> str:
         """Extract architecture description"""
-        # Extract first paragraph after section header
-        lines = content.split('\n')
+        # Extract first paragraph after section header. Only the first few lines
+        # after the first ### line are used, so lines are walked from there
+        # instead of splitting the whole section
         description = []
-        in_description = False
         
-        for line in lines:
-            if line.strip().startswith('###'):
-                in_description = True
-                continue
-            if in_description and line.strip() and not line.strip().startswith('|'):
-                description.append(line.strip())
-                if len(description) > 3:  # Limit to first few lines
-                    break
+        # First line that starts with ### (ignoring leading whitespace)
+        pos = content.find('###')
+        while pos != -1 and content[content.rfind('\n', 0, pos) + 1:pos].strip():
+            line_end = content.find('\n', pos)
+            pos = content.find('###', line_end) if line_end != -1 else -1
+        line_end = content.find('\n', pos) if pos != -1 else -1
+        
+        while line_end != -1 and len(description) <= 3:  # Limit to first few lines
+            line_start = line_end + 1
+            line_end = content.find('\n', line_start)
+            line = content[line_start:line_end if line_end != -1 else len(content)].strip()
+            if line and not line.startswith('###') and not line.startswith('|'):
+                description.append(line)
         
         return ' '.join(description)
     
     def _has_detailed_description(self, content: str) -> bool:
         """Check if architecture section has detailed description"""
         # Check for subsection headers or detailed content
-        return bool(re.search(r'###\s+.*(?:Description|Data Flow|Components)', content, re.IGNORECASE))
+        return bool(_DETAILED_DESCRIPTION_RE.search(content))
+    
+    # Section mappers in deck order. Each one runs even when its section is
+    # missing, so the deck always has the same skeleton
+    _MAPPERS = (
+        _map_cover_page,            # Slide 1: Cover Page
+        _map_project_requirement,   # Slide 2: Project Requirement Statement
+        _map_scope_of_work,         # Slide 3-4: Scope of Work
+        _map_system_architecture,   # Slide 5-6: System Architecture
+        _map_system_requirements,   # Slide 7-10: System Requirements
+        _map_implementation_plan,   # Slide 11-12: Implementation Plan
+        _map_proposed_modules,      # Slide 13-20+: Proposed Modules
+        _map_user_interface,        # Slide 21-23: User Interface & Reporting
+    )
 
 
 def map_proposal_to_slides(proposal_file: str, architecture_diagram: Optional[str] = None, output_dir: Optional[str] = None) -> Dict[str, str]:
@@ -1280,27 +1347,30 @@ def map_proposal_to_slides(proposal_file: str, architecture_diagram: Optional[st
     
     # Save JSON
     json_file = output_dir / f"{proposal_file.stem}_slide_structure.json"
-    with open(json_file, 'w', encoding='utf-8') as f:
-        json.dump(slide_structure, f, indent=2, ensure_ascii=False)
+    # Encoded in one call and written in one go; json.dump with indent streams
+    # many small chunks through the pure-Python encoder
+    json_file.write_bytes(dumps_json(slide_structure))
     print(f"✅ Saved slide structure to: {json_file}")
     
     # Save human-readable summary (optional)
     md_file = output_dir / f"{proposal_file.stem}_slide_content.md"
-    with open(md_file, 'w', encoding='utf-8') as f:
-        f.write(f"# Slide Content Summary: {slide_structure['project_name']}\n\n")
-        f.write(f"**Client:** {slide_structure['client_name']}\n")
-        f.write(f"**Total Slides:** {slide_structure['total_slides']}\n\n")
-        f.write("---\n\n")
-        
-        for slide in slide_structure['slides']:
-            f.write(f"## Slide {slide['slide_number']}: {slide.get('title', 'Untitled')}\n\n")
-            f.write(f"**Type:** {slide['type']}\n\n")
-            # Add content preview
-            if 'table' in slide:
-                f.write("**Content:** Table format\n\n")
-            elif 'content' in slide:
-                f.write(f"**Content:** {len(slide['content'])} bullet points\n\n")
-            f.write("---\n\n")
+    # Built in memory and written once, like the JSON above
+    summary = [
+        f"# Slide Content Summary: {slide_structure['project_name']}\n\n",
+        f"**Client:** {slide_structure['client_name']}\n",
+        f"**Total Slides:** {slide_structure['total_slides']}\n\n",
+        "---\n\n",
+    ]
+    for slide in slide_structure['slides']:
+        summary.append(f"## Slide {slide['slide_number']}: {slide.get('title', 'Untitled')}\n\n")
+        summary.append(f"**Type:** {slide['type']}\n\n")
+        # Add content preview
+        if 'table' in slide:
+            summary.append("**Content:** Table format\n\n")
+        elif 'content' in slide:
+            summary.append(f"**Content:** {len(slide['content'])} bullet points\n\n")
+        summary.append("---\n\n")
+    md_file.write_text(''.join(summary), encoding='utf-8')
     
     print(f"✅ Saved slide summary to: {md_file}")
     
@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""
+Output helpers shared by the scripts: buffered console output and JSON files
+"""
+
+import sys
+import json
+from pathlib import Path
+
+# orjson is a faster drop-in encoder/decoder; fall back to stdlib json if missing
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+
+def dumps_json(data):
+    """Pretty-print data as UTF-8 JSON bytes (indent=2, non-ASCII kept)."""
+    if HAS_ORJSON:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+
+
+def load_json(path):
+    """Read a JSON file, using orjson when available."""
+    data = Path(path).read_bytes()
+    return orjson.loads(data) if HAS_ORJSON else json.loads(data)
+
+
+def flush_output(out):
+    """Write buffered output lines to stdout in one call and reset the buffer."""
+    if out:
+        sys.stdout.write("\n".join(out) + "\n")
+        out.clear()
@@ -8,7 +8,6 @@ Usage:
 """
 
 import sys
-import json
 from pathlib import Path
 
 # Add script directory to path
@@ -17,6 +16,7 @@ sys.path.insert(0, str(Path(__file__).parent))
 # Import modules - use existing robust functions
 from generate_from_deal_transfer import generate_architecture_from_file
 from map_to_slides import map_proposal_to_slides
+from output_utils import dumps_json, load_json
 
 
 def generate_architecture(template_file, output_dir):
@@ -35,8 +35,7 @@ def generate_architecture(template_file, output_dir):
         
         # Save project_info.json for later use by insert_reference_slides.py
         project_info_file = output_dir / f"{template_file.stem}_project_info.json"
-        with open(project_info_file, 'w', encoding='utf-8') as f:
-            json.dump(project_info, f, indent=2, ensure_ascii=False)
+        project_info_file.write_bytes(dumps_json(project_info))
         print(f"✅ Project info saved to: {project_info_file}")
         
         return arch_file, project_info
@@ -74,8 +73,7 @@ def generate_powerpoint(slide_structure_file, output_dir):
     print("="*80)
     
     # Load slide structure
-    with open(slide_structure_file, 'r', encoding='utf-8') as f:
-        slide_structure = json.load(f)
+    slide_structure = load_json(slide_structure_file)
     
     project_name = slide_structure.get("project_name", "Proposal")
     pptx_file = output_dir / f"{project_name}_proposal.pptx"
@@ -10,6 +10,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent))
 
 from generate_from_deal_transfer import generate_architecture_from_file
+from generate_mermaid import ArchitectureGenerator
 
 
 def test_all_deployments():
@@ -77,6 +78,35 @@ def test_all_deployments():
     return results
 
 
+def test_diagram_cache_types():
+    """Cached diagrams must match an uncached build when values differ only by type"""
+    print("\n" + "=" * 80)
+    print("TESTING DIAGRAM CACHE KEYS")
+    print("=" * 80)
+    
+    cases = [
+        ("num_cameras", 8, 8.0),
+        ("include_nvr", 1, True),
+        ("compact_mode", 1, True),
+    ]
+    failures = 0
+    for method in ["on-prem", "cloud", "hybrid", "4g-vpn-bridge", "vimov"]:
+        for field, first, second in cases:
+            # Build the first value so it is cached, then check the second
+            for value in (first, second):
+                info = {"deployment_method": method, "num_cameras": 8,
+                        "ai_modules": ["Helmet Detection"], field: value}
+                cached = ArchitectureGenerator(dict(info)).generate()
+                uncached = ArchitectureGenerator(dict(info))._generate()
+                if cached != uncached:
+                    failures += 1
+                    print(f"❌ {method}: {field}={value!r} returned a stale cached diagram")
+    
+    print(f"{'✅' if not failures else '❌'} Cache key check: {failures} mismatches")
+    return failures == 0
+
+
 if __name__ == "__main__":
     test_all_deployments()
+    test_diagram_cache_types()
 